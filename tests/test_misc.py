@@ -0,0 +1,33 @@
+import io
+import unittest
+
+from uwsm.misc import LogFlag, print_fancy
+
+
+class PrintFancyLogprefixTest(unittest.TestCase):
+    "Checks loglevel line prefixes for non-tty output"
+
+    def setUp(self):
+        self.prefix = LogFlag.prefix
+        LogFlag.prefix = True
+
+    def tearDown(self):
+        LogFlag.prefix = self.prefix
+
+    def fancy(self, *what, **how):
+        out = io.StringIO()
+        print_fancy(*what, file=out, **how)
+        return out.getvalue()
+
+    def test_empty(self):
+        self.assertEqual(self.fancy(""), "<5>\n")
+
+    def test_trailing_newline(self):
+        self.assertEqual(self.fancy("a\nb\n"), "<5>a\n<5>b\n<5>\n")
+
+    def test_loglevel(self):
+        self.assertEqual(self.fancy("a", loglevel=3), "<3>a\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,21 +1,44 @@
+import time
+import functools
+from select import select
+from typing import Callable, Optional
 import dbus
 from uwsm.misc import print_debug
 
 
+@functools.lru_cache(maxsize=None)
+def load_glib():
+    """
+    Imports optional GLib main loop support on first use (only signal waits need it).
+    Returns (GLib, DBusGMainLoop) or None if unavailable.
+    """
+    try:
+        from gi.repository import GLib
+        from dbus.mainloop.glib import DBusGMainLoop
+    except ImportError:
+        return None
+    return (GLib, DBusGMainLoop)
+
+
 class DbusInteractions:
     "Handles UWSM interactions via DBus"
 
-    def __init__(self, dbus_level: str):
-        "Takes dbus_level as 'system' or 'session'"
+    def __init__(self, dbus_level: str, private: bool = False):
+        """
+        Takes dbus_level as 'system' or 'session'.
+        'private' opens own connection instead of dbus-python's shared one.
+        """
         if dbus_level in ["system", "session"]:
             print_debug("initiate dbus interaction", dbus_level)
             self.dbus_level = dbus_level
             self.dbus_objects = {}
+            # last known systemd activation environment, kept in sync with own changes
+            self.systemd_vars = None
             if "bus" not in self.dbus_objects:
                 if dbus_level == "system":
-                    self.dbus_objects["bus"] = dbus.SystemBus()
+                    self.dbus_objects["bus"] = dbus.SystemBus(private=private)
                 else:
-                    self.dbus_objects["bus"] = dbus.SessionBus()
+                    self.dbus_objects["bus"] = dbus.SessionBus(private=private)
         else:
             raise ValueError(
                 f"dbus_level can be 'system' or 'session', got '{dbus_level}'"
@@ -69,17 +92,28 @@ class DbusInteractions:
     def add_systemd_unit_properties(self, unit_id):
         "Adds unit properties interface of unit_id into nested unit_properties dict"
         self.add_systemd_manager_interface()
-        unit_path = self.dbus_objects["bus"].get_object(
-            "org.freedesktop.systemd1",
-            self.dbus_objects["systemd_manager_interface"].GetUnit(unit_id),
-        )
         if "unit_properties" not in self.dbus_objects:
             self.dbus_objects["unit_properties"] = {}
         if unit_id not in self.dbus_objects["unit_properties"]:
+            unit_path = self.dbus_objects["bus"].get_object(
+                "org.freedesktop.systemd1",
+                self.dbus_objects["systemd_manager_interface"].GetUnit(unit_id),
+            )
             self.dbus_objects["unit_properties"][unit_id] = dbus.Interface(
                 unit_path, "org.freedesktop.DBus.Properties"
             )
 
+    def add_signal_bus(self):
+        "Adds private bus connection attached to GLib main loop for receiving signals"
+        if "signal_bus" not in self.dbus_objects:
+            glib = load_glib()
+            if glib is None:
+                raise RuntimeError("Receiving signals requires GLib (gi module)")
+            bus_type = (
+                dbus.SystemBus if self.dbus_level == "system" else dbus.SessionBus
+            )
+            self.dbus_objects["signal_bus"] = bus_type(private=True, mainloop=glib[1]())
+
     def add_dbus(self):
         "Adds /org/freedesktop/DBus object"
         if "dbus" not in self.dbus_objects:
@@ -150,6 +184,107 @@ class DbusInteractions:
             )
         return props
 
+    def subscribe_systemd(self):
+        "Subscribes signal bus to systemd manager signals (only if they can be received)"
+        if load_glib() is not None and "systemd_subscribed" not in self.dbus_objects:
+            self.add_signal_bus()
+            dbus.Interface(
+                self.dbus_objects["signal_bus"].get_object(
+                    "org.freedesktop.systemd1", "/org/freedesktop/systemd1"
+                ),
+                "org.freedesktop.systemd1.Manager",
+            ).Subscribe()
+            self.dbus_objects["systemd_subscribed"] = True
+
+    def wait_signal(
+        self,
+        precheck: Callable[[], bool],
+        signal_name: str,
+        dbus_interface: str,
+        check: Callable[..., bool],
+        path: Optional[str] = None,
+        timeout: Optional[float] = None,
+        watch_fds: tuple = (),
+        poll_step: float = 0.5,
+        tick: Optional[Callable[[], None]] = None,
+    ) -> Optional[bool]:
+        """
+        Waits until 'precheck' or 'check' (receives args of matching signal) returns True.
+        Returns True on success, False on 'timeout', None if any of 'watch_fds' became readable.
+        Calls 'tick' (if given) every 'poll_step' seconds while waiting.
+        Signals are received on a separate private connection with GLib main loop,
+        without GLib falls back to calling 'precheck' every 'poll_step' seconds.
+        """
+        glib = load_glib()
+        if glib is None:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                if precheck():
+                    return True
+                wait = poll_step
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        return False
+                if watch_fds:
+                    if select(watch_fds, [], [], wait)[0]:
+                        return None
+                else:
+                    time.sleep(wait)
+                if tick is not None:
+                    tick()
+
+        GLib = glib[0]
+        self.add_signal_bus()
+        result = [False]
+        loop = GLib.MainLoop()
+
+        def on_signal(*args):
+            if result[0] is False and check(*args):
+                result[0] = True
+                loop.quit()
+
+        def on_fd(*_):
+            if result[0] is False:
+                result[0] = None
+            loop.quit()
+            return True
+
+        def on_timeout():
+            loop.quit()
+            return True
+
+        def on_tick():
+            tick()
+            return True
+
+        match = self.dbus_objects["signal_bus"].add_signal_receiver(
+            on_signal,
+            signal_name=signal_name,
+            dbus_interface=dbus_interface,
+            path=path,
+        )
+        sources = [
+            GLib.io_add_watch(
+                fd, GLib.PRIORITY_DEFAULT, GLib.IO_IN | GLib.IO_HUP, on_fd
+            )
+            for fd in watch_fds
+        ]
+        if tick is not None:
+            sources.append(GLib.timeout_add(int(poll_step * 1000), on_tick))
+        if timeout is not None:
+            sources.append(GLib.timeout_add(int(timeout * 1000), on_timeout))
+        try:
+            # cover whatever happened before signal receiver was added
+            if precheck():
+                return True
+            loop.run()
+        finally:
+            match.remove()
+            for source in sources:
+                GLib.source_remove(source)
+        return result[0]
+
     # External functions (doing stuff via objects)
 
     def get_unit_property(self, unit_id, unit_property):
@@ -159,6 +294,13 @@ class DbusInteractions:
             "org.freedesktop.systemd1.Unit", unit_property
         )
 
+    def get_service_property(self, unit_id, service_property):
+        "Returns value of service unit property"
+        self.add_systemd_unit_properties(unit_id)
+        return self.dbus_objects["unit_properties"][unit_id].Get(
+            "org.freedesktop.systemd1.Service", service_property
+        )
+
     def reload_systemd(self):
         "Reloads systemd manager, returns job"
         self.add_systemd_manager_interface()
@@ -169,6 +311,93 @@ class DbusInteractions:
         self.add_systemd_manager_interface()
         return self.dbus_objects["systemd_manager_interface"].ListJobs()
 
+    def wait_systemd_job(self, job, timeout: Optional[float] = None) -> bool:
+        "Waits for systemd job (object path) to finish, returns False on timeout"
+        job = str(job)
+
+        def not_listed():
+            return job not in [str(j[4]) for j in self.list_systemd_jobs()]
+
+        self.subscribe_systemd()
+        print_debug("waiting for job", job)
+        # no watch_fds, so wait_signal() can not return None here
+        return bool(
+            self.wait_signal(
+                precheck=not_listed,
+                signal_name="JobRemoved",
+                dbus_interface="org.freedesktop.systemd1.Manager",
+                check=lambda job_id, job_path, unit, result: str(job_path) == job,
+                path="/org/freedesktop/systemd1",
+                timeout=timeout,
+                poll_step=0.1,
+            )
+        )
+
+    @staticmethod
+    def get_unit_object_path(unit: str) -> str:
+        "Returns systemd object path of unit (escaped the same way systemd does)"
+        label = "".join(
+            (
+                char
+                if char.isascii() and (char.isalpha() or (idx and char.isdigit()))
+                else "".join(f"_{byte:02x}" for byte in char.encode("utf-8"))
+            )
+            for idx, char in enumerate(unit)
+        )
+        return f"/org/freedesktop/systemd1/unit/{label or '_'}"
+
+    def wait_unit_active(
+        self,
+        unit: str,
+        timeout: Optional[float] = None,
+        watch_fds=(),
+        path: Optional[str] = None,
+    ) -> Optional[bool]:
+        "Waits for unit to become active or activating, returns like wait_signal()"
+        states = ("active", "activating")
+        self.subscribe_systemd()
+        print_debug("waiting for unit", unit)
+        return self.wait_signal(
+            precheck=lambda: bool(self.list_units_by_patterns(list(states), [unit])),
+            signal_name="PropertiesChanged",
+            dbus_interface="org.freedesktop.DBus.Properties",
+            check=lambda interface, changed, invalidated: (
+                interface == "org.freedesktop.systemd1.Unit"
+                and str(changed.get("ActiveState", "")) in states
+            ),
+            path=path or self.get_unit_object_path(unit),
+            timeout=timeout,
+            watch_fds=watch_fds,
+        )
+
+    def wait_systemd_job_done(
+        self, unit: str, job_type: str, timeout: Optional[float] = None, tick=None
+    ) -> bool:
+        "Waits while job of job_type for unit is queued, returns False on timeout"
+
+        def not_queued():
+            return (unit, job_type) not in [
+                (str(job[1]), str(job[2])) for job in self.list_systemd_jobs()
+            ]
+
+        self.subscribe_systemd()
+        print_debug(f"waiting for {job_type} job of unit", unit)
+        # no watch_fds, so wait_signal() can not return None here
+        return bool(
+            self.wait_signal(
+                precheck=not_queued,
+                signal_name="JobRemoved",
+                dbus_interface="org.freedesktop.systemd1.Manager",
+                check=lambda job_id, job_path, job_unit, result: (
+                    str(job_unit) == unit and not_queued()
+                ),
+                path="/org/freedesktop/systemd1",
+                timeout=timeout,
+                poll_step=1,
+                tick=tick,
+            )
+        )
+
     def set_dbus_vars(self, vars_dict: dict):
         "Takes dict of ENV vars, puts them to dbus activation environment"
         self.add_dbus_interface()
@@ -179,14 +408,24 @@ class DbusInteractions:
         self.add_systemd_manager_interface()
         assignments = [f"{var}={value}" for var, value in vars_dict.items()]
         self.dbus_objects["systemd_manager_interface"].SetEnvironment(assignments)
+        if self.systemd_vars is not None:
+            self.systemd_vars.update(vars_dict)
 
     def unset_systemd_vars(self, vars_list: list):
         "Takes list of ENV var names, unsets them from systemd activation environment"
         self.add_systemd_manager_interface()
         self.dbus_objects["systemd_manager_interface"].UnsetEnvironment(vars_list)
+        if self.systemd_vars is not None:
+            for var in vars_list:
+                self.systemd_vars.pop(var, None)
 
-    def get_systemd_vars(self):
-        "Returns dict of ENV vars from systemd activation environment"
+    def get_systemd_vars(self, cached: bool = False):
+        """
+        Returns dict of ENV vars from systemd activation environment.
+        'cached': reuse result of previous call (updated by own set/unset) if any
+        """
+        if cached and self.systemd_vars is not None:
+            return dict(self.systemd_vars)
         self.add_systemd_properties_interface()
         assignments = self.dbus_objects["systemd_properties_interface"].Get(
             "org.freedesktop.systemd1.Manager", "Environment"
@@ -197,8 +436,23 @@ class DbusInteractions:
         for assignment in assignments:
             var, value = str(assignment).split("=", maxsplit=1)
             env.update({var: value})
+        self.systemd_vars = dict(env)
         return env
 
+    def get_systemd_varnames(self, only: Optional[set] = None) -> set:
+        """
+        Returns set of var names in systemd activation environment.
+        'only': return only names from this set
+        """
+        self.add_systemd_properties_interface()
+        assignments = self.dbus_objects["systemd_properties_interface"].Get(
+            "org.freedesktop.systemd1.Manager", "Environment"
+        )
+        varnames = (str(assignment).partition("=")[0] for assignment in assignments)
+        if only is None:
+            return set(varnames)
+        return {var for var in varnames if var in only}
+
     def list_units_by_patterns(self, states: list, patterns: list):
         "Takes a list of unit states and a list of unit patterns, returns list of dbus structs"
         self.add_systemd_manager_interface()
@@ -206,6 +460,11 @@ class DbusInteractions:
             states, patterns
         )
 
+    def start_unit(self, unit: str, job_mode: str = "replace"):
+        "Starts unit, returns job"
+        self.add_systemd_manager_interface()
+        return self.dbus_objects["systemd_manager_interface"].StartUnit(unit, job_mode)
+
     def stop_unit(self, unit: str, job_mode: str = "fail"):
         self.add_systemd_manager_interface()
         return self.dbus_objects["systemd_manager_interface"].StopUnit(unit, job_mode)
@@ -256,3 +515,29 @@ class DbusInteractions:
             hints,
             expire_timeout,
         )
+
+
+# DbusInteractions instances shared within process, by dbus_level
+BUSES: dict = {}
+
+
+def get_bus(dbus_level: str) -> DbusInteractions:
+    """
+    Returns DbusInteractions instance for dbus_level, shared within process.
+    Instance owns a private connection, so after drop_bus() the next call really
+    opens a new connection (dbus-python's shared one would be handed out again).
+    """
+    if dbus_level not in BUSES:
+        BUSES[dbus_level] = DbusInteractions(dbus_level, private=True)
+    return BUSES[dbus_level]
+
+
+def drop_bus(dbus_level: Optional[str] = None, close: bool = True):
+    """
+    Forgets shared instance for dbus_level (all if None), next get_bus() reconnects.
+    'close' closes dropped connections, disable for ones inherited from parent process.
+    """
+    for level in list(BUSES) if dbus_level is None else [dbus_level]:
+        bus = BUSES.pop(level, None)
+        if bus is not None and close:
+            bus.dbus_objects["bus"].close()
@@ -20,15 +20,18 @@ import os
 import sys
 import shlex
 import argparse
-import re
+import json
+import hashlib
 import subprocess
 import textwrap
 import time
 import signal
+import socket
 import stat
-from typing import List, Callable
+import functools
+from typing import List, Callable, Optional
 from urllib import parse as urlparse
-from select import select
+from select import poll, POLLIN
 
 from xdg import BaseDirectory
 from xdg.util import which
@@ -37,7 +40,7 @@ from xdg.Exceptions import ValidationError
 
 from uwsm.params import *
 from uwsm.misc import *
-from uwsm.dbus import DbusInteractions
+from uwsm.dbus import DbusInteractions, get_bus, drop_bus
 
 
 class CompGlobals:
@@ -50,6 +53,9 @@ class CompGlobals:
     id: str = None
     # escaped id string for unit specifier
     id_unit_string: str = None
+    # main compositor service unit name and its systemd object path
+    unit_name: str = None
+    unit_path: str = None
     # basename of cmdline[0]
     bin_name: str = None
     # processed function-friendly cmdline[0]
@@ -75,7 +81,11 @@ class Terminal:
     entry: any = None
     entry_id: str = ""
     entry_action_id: str = ""
+    # expanded exec arg of entry
+    execarg: Optional[List[str]] = None
     neg_cache: dict = {}
+    # mtimes of paths affecting the choice of cached entry
+    stamp: Optional[tuple] = None
 
 
 class UnitsState:
@@ -83,6 +93,11 @@ class UnitsState:
     changed: bool = False
 
 
+class Plugins:
+    "Holds found plugin paths by bin_id"
+    paths: dict = {}
+
+
 class HelpFormatterNewlines(argparse.HelpFormatter):
     "Treats double newlines as line breaks, preserves indents after them"
 
@@ -111,40 +126,76 @@ class HelpFormatterNewlines(argparse.HelpFormatter):
         return lines
 
 
+class ArgumentParserTerse(argparse.ArgumentParser):
+    "Drops descriptions, epilogs and argument help texts unless keep_help is set"
+
+    def __init__(self, *args, keep_help: bool = True, **kwargs):
+        self.keep_help = keep_help
+        if not keep_help:
+            kwargs.pop("description", None)
+            kwargs.pop("epilog", None)
+        super().__init__(*args, **kwargs)
+
+    def add_subparsers(self, **kwargs):
+        "Subparsers inherit keep_help"
+        kwargs.setdefault(
+            "parser_class",
+            functools.partial(type(self), keep_help=self.keep_help),
+        )
+        return super().add_subparsers(**kwargs)
+
+    def _add_action(self, action):
+        "Also receives actions from groups and parents"
+        if not self.keep_help:
+            action.help = None
+        return super()._add_action(action)
+
+
 class Varnames:
-    "Sets of varnames"
-    always_export = {
-        "PATH",
-        "XDG_CURRENT_DESKTOP",
-        "XDG_MENU_PREFIX",
-        "XDG_SEAT",
-        "XDG_SEAT_PATH",
-        "XDG_SESSION_DESKTOP",
-        "XDG_SESSION_ID",
-        "XDG_SESSION_PATH",
-        "XDG_SESSION_TYPE",
-        "XDG_VTNR",
-    }
-    never_export = {"PWD", "LS_COLORS", "INVOCATION_ID", "SHLVL", "SHELL", "TERM"}
-    always_unset = {"DISPLAY", "WAYLAND_DISPLAY"}
-    always_cleanup = {
-        "DISPLAY",
-        "LANG",
-        "PATH",
-        "WAYLAND_DISPLAY",
-        "XCURSOR_SIZE",
-        "XCURSOR_THEME",
-        "XDG_CURRENT_DESKTOP",
-        "XDG_MENU_PREFIX",
-        "XDG_SEAT",
-        "XDG_SEAT_PATH",
-        "XDG_SESSION_DESKTOP",
-        "XDG_SESSION_ID",
-        "XDG_SESSION_PATH",
-        "XDG_SESSION_TYPE",
-        "XDG_VTNR",
-    }
-    never_cleanup = {"SSH_AGENT_LAUNCHER", "SSH_AUTH_SOCK", "SSH_AGENT_PID"}
+    "Frozen sets of varnames"
+    always_export = frozenset(
+        {
+            "PATH",
+            "XDG_CURRENT_DESKTOP",
+            "XDG_MENU_PREFIX",
+            "XDG_SEAT",
+            "XDG_SEAT_PATH",
+            "XDG_SESSION_DESKTOP",
+            "XDG_SESSION_ID",
+            "XDG_SESSION_PATH",
+            "XDG_SESSION_TYPE",
+            "XDG_VTNR",
+        }
+    )
+    never_export = frozenset(
+        {"PWD", "LS_COLORS", "INVOCATION_ID", "SHLVL", "SHELL", "TERM"}
+    )
+    always_unset = frozenset({"DISPLAY", "WAYLAND_DISPLAY"})
+    always_cleanup = frozenset(
+        {
+            "DISPLAY",
+            "LANG",
+            "PATH",
+            "WAYLAND_DISPLAY",
+            "XCURSOR_SIZE",
+            "XCURSOR_THEME",
+            "XDG_CURRENT_DESKTOP",
+            "XDG_MENU_PREFIX",
+            "XDG_SEAT",
+            "XDG_SEAT_PATH",
+            "XDG_SESSION_DESKTOP",
+            "XDG_SESSION_ID",
+            "XDG_SESSION_PATH",
+            "XDG_SESSION_TYPE",
+            "XDG_VTNR",
+            "UWSM_ENV_DIGEST",
+        }
+    )
+    never_cleanup = frozenset({"SSH_AGENT_LAUNCHER", "SSH_AUTH_SOCK", "SSH_AGENT_PID"})
+    # derived
+    export_forced = always_export - never_export - always_unset
+    export_excluded = never_export | always_unset
+    cleanup_forced = always_cleanup - never_cleanup
 
 
 class MainArg:
@@ -176,7 +227,7 @@ class MainArg:
             if ":" in arg:
                 self.entry_id, entry_action = arg.split(":", maxsplit=1)
                 if entry_action:
-                    if not Val.action_id.search(entry_action):
+                    if not Val.action_id.fullmatch(entry_action):
                         raise ValueError(
                             f'Invalid Desktop Entry Action "{entry_action}"'
                         )
@@ -200,7 +251,7 @@ class MainArg:
                         break
 
             # validate id
-            if not Val.entry_id.search(self.entry_id):
+            if not Val.entry_id.fullmatch(self.entry_id):
                 raise ValueError(f'Invalid Desktop Entry ID "{self.entry_id}"')
 
         # Executable
@@ -227,7 +278,7 @@ class MainArg:
         "Checks if executable is reachable and executable"
         if self.executable is None:
             raise ValueError(f"Argument is not an executable: {self}")
-        if not which(self.executable):
+        if not which_cached(self.executable):
             raise FileNotFoundError(
                 f'"{self.executable}" not found or is not executable!'
             )
@@ -245,6 +296,25 @@ class MainArg:
         print_debug(f"Path {self.path} OK")
 
 
+# found executables by (name, PATH), filled by which_cached()
+WHICH_FOUND: dict = {}
+
+
+def which_cached(name: str):
+    "Wraps which(), remembers found executables per PATH value, rechecks them on reuse"
+    key = (name, os.getenv("PATH", ""))
+    path = WHICH_FOUND.get(key)
+    if path is not None and os.access(path, os.X_OK):
+        return path
+    path = which(name)
+    # only remember hits, so newly installed executables are picked up
+    if path:
+        WHICH_FOUND[key] = path
+    else:
+        WHICH_FOUND.pop(key, None)
+    return path
+
+
 def entry_expand_str(value: str):
     """
     Expands escape sequences \\s, \\n, \\t, \\r, and \\\\ for a string from desktop entry according to
@@ -381,6 +451,21 @@ def entry_action_keys(entry, entry_action=None):
     return out
 
 
+def entry_display_name(entry) -> str:
+    "Returns expanded Name and GenericName of entry joined by ' - ', cached in entry object"
+    cache = entry.__dict__.setdefault("uwsm_display_names", {})
+    if entry.defaultGroup not in cache:
+        cache[entry.defaultGroup] = " - ".join(
+            n
+            for n in (
+                entry_expand_str(entry.getName()),
+                entry_expand_str(entry.getGenericName()),
+            )
+            if n
+        )
+    return cache[entry.defaultGroup]
+
+
 def check_entry_basic(entry, entry_action=None):
     "Takes entry, performs basic checks, raises RuntimeError on failure"
     try:
@@ -458,9 +543,20 @@ def check_entry_basic(entry, entry_action=None):
         )
 
 
+@functools.lru_cache(maxsize=8)
+def split_desktop_names(value: str) -> tuple:
+    "Splits :-separated desktop names, returns tuple (cached by value)"
+    return tuple(sane_split(value, ":"))
+
+
+def get_current_desktops() -> tuple:
+    "Returns XDG_CURRENT_DESKTOP split into a tuple"
+    return split_desktop_names(os.getenv("XDG_CURRENT_DESKTOP", ""))
+
+
 def check_entry_showin(entry):
     "Takes entry, checks OnlyShowIn/NotShowIn against XDG_CURRENT_DESKTOP, raises RuntimeError on failure"
-    xcd = set(sane_split(os.getenv("XDG_CURRENT_DESKTOP", ""), ":"))
+    xcd = get_current_desktops()
     osi = set(entry.getOnlyShowIn())
     nsi = set(entry.getNotShowIn())
     if osi and osi.isdisjoint(xcd):
@@ -475,7 +571,7 @@ def entry_parser_session(entry_id, entry_path):
     try:
         entry = DesktopEntry(entry_path)
     except Exception:
-        print_debug(f"failed parsing {entry_path}, skipping")
+        print_debug("failed parsing", entry_path, "skipping")
         return ("drop", None)
     try:
         check_entry_basic(entry)
@@ -560,7 +656,7 @@ def entry_parser_terminal(
                 # otherwise, add to cart
                 results.append((entry, entry_id, entry_action))
             except RuntimeError:
-                print_debug(f"action {entry_action} failed basic checks")
+                print_debug("action", entry_action, "failed basic checks")
         if results:
             return ("extend", results)
         return ("drop", (None, None, None))
@@ -588,6 +684,7 @@ def find_entries(
     parser_args: dict = None,
     reject_pmt: dict = None,
     reject_ids: List[str] = None,
+    accept_ids: set = None,
 ):
     """
     Takes data hierarchy subpath and optional arg parser
@@ -598,6 +695,7 @@ def find_entries(
     otherwise returns whatever parser tells in a list.
     reject_pmt is a mapping of path to mtime for quick rejection
     reject_id is a list of entry ids for quick rejection
+    accept_ids is a set of entry ids to consider exclusively, search stops when all are seen
     """
     seen_ids = set()
     results = []
@@ -605,6 +703,8 @@ def find_entries(
         parser_args = {}
 
     print_debug(f"searching entries in {subpath}")
+    # bound once for the walk over all data dirs
+    entry_id_fullmatch = Val.entry_id.fullmatch
     # iterate over data paths
     for data_dir in BaseDirectory.load_data_paths(subpath):
         # walk tree relative to data_dir
@@ -622,7 +722,7 @@ def find_entries(
                     and entry_path in reject_pmt
                     and os.path.getmtime(entry_path) == reject_pmt[entry_path]
                 ):
-                    print_debug(f"rejected {entry_path} by path to mtime mapping")
+                    print_debug("rejected", entry_path, "by path to mtime mapping")
                     continue
 
                 # get proper entry id relative to data_dir with path delimiters replaced by '-'
@@ -630,20 +730,24 @@ def find_entries(
 
                 # quick reject on reject_ids list
                 if reject_ids and entry_id in reject_ids:
-                    print_debug(f"rejected {entry_path} by id list")
+                    print_debug("rejected", entry_path, "by id list")
+                    continue
+
+                # quick reject if not in accept_ids
+                if accept_ids is not None and entry_id not in accept_ids:
                     continue
 
                 # get only valid IDs
-                if not Val.entry_id.search(entry_id):
+                if not entry_id_fullmatch(entry_id):
                     continue
 
                 # id-based deduplication
                 if entry_id in seen_ids:
-                    print_debug(f"already seen {entry_id}")
+                    print_debug("already seen", entry_id)
                     continue
                 seen_ids.add(entry_id)
 
-                print_debug(f"considering {entry_id} {entry_path}")
+                print_debug("considering", entry_id, entry_path)
                 if callable(parser):
                     action, data = parser(entry_id, entry_path, **parser_args)
                 else:
@@ -656,6 +760,12 @@ def find_entries(
                 if action == "extend":
                     results.extend(data)
 
+                # all accepted ids are processed
+                if accept_ids is not None and accept_ids.issubset(seen_ids):
+                    print_debug("all accepted ids are seen")
+                    print_debug(results)
+                    return results
+
     print_debug(results)
     return results
 
@@ -846,6 +956,21 @@ def select_comp_entry(default="", just_confirm=False):
     return sprc.stderr.strip() if sprc.returncode == 0 and sprc.stderr else ""
 
 
+def select_and_save_comp_entry(just_confirm=False) -> str:
+    """
+    Runs compositor selection with current default, saves selection as new default.
+    Returns selected ID or empty string
+    """
+    default_id = get_default_comp_entry()
+    select_wm_id = select_comp_entry(default_id, just_confirm)
+    if select_wm_id:
+        if select_wm_id == default_id:
+            print_normal(f"Default compositor ID unchanged: {select_wm_id}.")
+        else:
+            save_default_comp_entry(select_wm_id)
+    return select_wm_id
+
+
 def reload_systemd():
     "Reloads systemd user manager"
 
@@ -855,7 +980,7 @@ def reload_systemd():
         return True
 
     print_normal("Reloading systemd user manager.")
-    bus_session = DbusInteractions("session")
+    bus_session = get_bus("session")
     print_debug("bus_session initial", bus_session)
 
     job = bus_session.reload_systemd()
@@ -877,11 +1002,11 @@ def set_systemd_vars(vars_dict: dict, dbus_only=False, verbose=True, bus_session
     "Exports vars from given dict to systemd user manager"
 
     if bus_session is None:
-        bus_session = DbusInteractions("session")
+        bus_session = get_bus("session")
         print_debug("bus_session initial", bus_session)
 
-    # get existing environment (for info only)
-    existing_vars_dict = bus_session.get_systemd_vars()
+    # get existing environment (for info only, known state is good enough)
+    existing_vars_dict = bus_session.get_systemd_vars(cached=True)
 
     # compose vars list for message
     vars_msg = []
@@ -902,10 +1027,19 @@ def set_systemd_vars(vars_dict: dict, dbus_only=False, verbose=True, bus_session
         "Exporting variables to systemd user manager:\n  " + "\n  ".join(vars_msg)
     )
 
-    if not dbus_only:
-        bus_session.set_systemd_vars(vars_dict)
-    else:
+    if dbus_only:
         print_debug("skipped managing systemd activation environment")
+    else:
+        # only send what differs
+        changed_vars_dict = {
+            var: value
+            for var, value in vars_dict.items()
+            if existing_vars_dict.get(var) != value
+        }
+        if changed_vars_dict:
+            bus_session.set_systemd_vars(changed_vars_dict)
+        else:
+            print_debug("all vars are already set in systemd activation environment")
 
     # check what dbus service is running
     # if it is not dbus-broker, also set dbus environment vars
@@ -937,7 +1071,7 @@ def unset_systemd_vars(vars_list, bus_session=None):
     "Unsets vars from given list from systemd user manager"
 
     if bus_session is None:
-        bus_session = DbusInteractions("session")
+        bus_session = get_bus("session")
         print_debug("bus_session initial", bus_session)
 
     # print message about env unset
@@ -953,9 +1087,7 @@ def unset_systemd_vars(vars_list, bus_session=None):
             "dbus unit", dbus_unit, "managing separate dbus activation environment"
         )
 
-        vars_dict = {}
-        for var in vars_list:
-            vars_dict.update({var: ""})
+        vars_dict = dict.fromkeys(vars_list, "")
 
         print_normal(
             "Also writing empty values to dbus environment (consider switching to dbus-broker)"
@@ -971,27 +1103,51 @@ def char2cesc(string: str) -> str:
     return "".join("\\x%02x" % b for b in bytes(string, "utf-8"))
 
 
+# str.translate table for simple_systemd_escape() over utf-8 bytes decoded as latin-1:
+# '/' becomes '-', anything but ._0-9:A-Za-z becomes c-style escape
+SYSTEMD_ESCAPE_TABLE = {
+    byte: "-" if byte == 47 else "\\x%02x" % byte
+    for byte in range(256)
+    if not (
+        byte in (46, 95) or 48 <= byte <= 58 or 65 <= byte <= 90 or 97 <= byte <= 122
+    )
+}
+
+
 def simple_systemd_escape(string: str, start: bool = True) -> str:
     """
     Escapes simple strings by systemd rules.
     Set 'start=False' if string is not intended for start of resulting string
     """
-    out = []
+    prefix = ""
     # escape '.' if starts with it
     if start and string.startswith("."):
-        out.append(char2cesc("."))
+        prefix = char2cesc(".")
         string = string[1:]
-    for ch, ucp in ((c, ord(c)) for c in string):
-        # replace '/' with '-'
-        if ch == "/":
-            out.append("-")
-        # append as is if ._0-9:A-Z
-        elif ucp in [46, 95] or 48 <= ucp <= 58 or 65 <= ucp <= 90 or 97 <= ucp <= 122:
-            out.append(ch)
-        # append c-style escape
+    return prefix + string.encode("utf-8").decode("latin-1").translate(
+        SYSTEMD_ESCAPE_TABLE
+    )
+
+
+def truncate_escaped(string: str, length: int) -> str:
+    """
+    Truncates systemd-escaped string to given length
+    without breaking '\\xXX' sequences (those are kept only if below length)
+    """
+    out_len = 0
+    idx = 0
+    while idx < len(string):
+        if string.startswith("\\x", idx):
+            if out_len + 4 >= length:
+                break
+            out_len += 4
+            idx += 4
+        elif out_len < length:
+            out_len += 1
+            idx += 1
         else:
-            out.append(char2cesc(ch))
-    return "".join(out)
+            break
+    return string[:idx]
 
 
 def get_unit_path(unit: str, category: str = "runtime", level: str = "user"):
@@ -1027,7 +1183,7 @@ def get_active_wm_unit(active=True, activating=True, bus_session=None):
     """
 
     if bus_session is None:
-        bus_session = DbusInteractions("session")
+        bus_session = get_bus("session")
         print_debug("bus_session initial", bus_session)
 
     # query systemd dbus for matching units
@@ -1071,7 +1227,7 @@ def is_active(check_wm_id="", verbose=False, verbose_active=False, bus_session=N
     verbose_active=True prints matched active units
     """
     if bus_session is None:
-        bus_session = DbusInteractions("session")
+        bus_session = get_bus("session")
         print_debug("bus_session initial", bus_session)
 
     check_units_generic = [
@@ -1554,9 +1710,7 @@ def generate_units():
     wm_specific_preloader = (
         f"wayland-wm-env@{CompGlobals.id_unit_string}.service.d/50_custom.conf"
     )
-    wm_specific_service = (
-        f"wayland-wm@{CompGlobals.id_unit_string}.service.d/50_custom.conf"
-    )
+    wm_specific_service = f"{CompGlobals.unit_name}.d/50_custom.conf"
     # initial data as lists for later joining
     wm_specific_preloader_data = [
         dedent(
@@ -1776,6 +1930,8 @@ class Args:
 
     parsers = argparse.Namespace()
     parsed = argparse.Namespace()
+    # built parsers for custom args, keyed by build_parsers() arguments
+    parsers_cache: dict = {}
 
     def __init__(self, custom_args=None, exit_on_error=True, store_parsers=False):
         "Parses sys.argv[1:] or custom_args"
@@ -1786,11 +1942,48 @@ class Args:
             f"exit_on_error: {exit_on_error}",
         )
 
+        args = sys.argv[1:] if custom_args is None else custom_args
+
+        # help texts are only needed if help is requested
+        # (crude check, false positives only cost some memory)
+        keep_help = any(arg.startswith("-") and "h" in arg for arg in args)
+
+        # find the first of '-T' or '--' without scanning the rest of args
+        first_marker = next((arg for arg in args if arg in ("-T", "--")), None)
+
+        # parsers only depend on these, reuse them for repeated custom args
+        # (app daemon requests)
+        parsers_key = (exit_on_error, keep_help, first_marker == "-T")
+        if custom_args is not None and parsers_key in self.parsers_cache:
+            parsers = self.parsers_cache[parsers_key]
+        else:
+            parsers = self.build_parsers(*parsers_key)
+            if custom_args is not None:
+                self.parsers_cache[parsers_key] = parsers
+
+        if custom_args is None:
+            # store args globally
+            parsers["main"].parse_args(namespace=self.parsed)
+            if store_parsers:
+                self.parsers.__dict__.update(parsers)
+        else:
+            # store args in instance
+            self.parsed = parsers["main"].parse_args(custom_args)
+            if store_parsers:
+                self.parsers = argparse.Namespace(**parsers)
+
+    @staticmethod
+    def build_parsers(
+        exit_on_error: bool, keep_help: bool, empty_cmdline: bool
+    ) -> dict:
+        "Builds parsers, returns them in a dict"
+
         # keep parsers in a dict
         parsers = {}
 
         # main parser with subcommands
-        parsers["main"] = argparse.ArgumentParser(
+        parsers["main"] = ArgumentParserTerse(
+            keep_help=keep_help,
             formatter_class=HelpFormatterNewlines,
             description=dedent(
                 """
@@ -1821,7 +2014,8 @@ class Args:
         )
 
         # compositor arguments for reuse via parents
-        parsers["wm_args"] = argparse.ArgumentParser(
+        parsers["wm_args"] = ArgumentParserTerse(
+            keep_help=keep_help,
             add_help=False,
             formatter_class=HelpFormatterNewlines,
             exit_on_error=exit_on_error,
@@ -1841,7 +2035,8 @@ class Args:
             ),
         )
 
-        parsers["wm_args_raw"] = argparse.ArgumentParser(
+        parsers["wm_args_raw"] = ArgumentParserTerse(
+            keep_help=keep_help,
             add_help=False,
             formatter_class=HelpFormatterNewlines,
             exit_on_error=exit_on_error,
@@ -1853,14 +2048,16 @@ class Args:
             help="Full Compositor command line.",
         )
 
-        parsers["wm_id"] = argparse.ArgumentParser(
+        parsers["wm_id"] = ArgumentParserTerse(
+            keep_help=keep_help,
             add_help=False,
             formatter_class=HelpFormatterNewlines,
             exit_on_error=exit_on_error,
         )
         parsers["wm_id"].add_argument("wm_id", metavar="ID", help="Compositor ID.")
 
-        parsers["wm_meta"] = argparse.ArgumentParser(
+        parsers["wm_meta"] = ArgumentParserTerse(
+            keep_help=keep_help,
             add_help=False,
             formatter_class=HelpFormatterNewlines,
             exit_on_error=exit_on_error,
@@ -2058,16 +2255,7 @@ class Args:
             "cmdline",
             metavar="args",
             # allow empty cmdline if '-T' is given and comes before '--'
-            nargs=(
-                "*"
-                if [
-                    arg
-                    for arg in (sys.argv[1:] if custom_args is None else custom_args)
-                    if arg in ("-T", "--")
-                ][0:1]
-                == ["-T"]
-                else "+"
-            ),
+            nargs=("*" if empty_cmdline else "+"),
             help=dedent(
                 """
                 Application command line. The first argument can be either one of:\n
@@ -2318,16 +2506,7 @@ class Args:
             help="Names of additional variables to wait for",
         )
 
-        if custom_args is None:
-            # store args globally
-            parsers["main"].parse_args(namespace=self.parsed)
-            if store_parsers:
-                self.parsers.__dict__.update(parsers)
-        else:
-            # store args in instance
-            self.parsed = parsers["main"].parse_args(custom_args)
-            if store_parsers:
-                self.parsers = argparse.Namespace(**parsers)
+        return parsers
 
     def __str__(self):
         return str({"parsed": self.parsed})
@@ -2351,17 +2530,22 @@ def append_to_cleanup_file(varnames, skip_always_cleanup=False, create=True):
         print_debug("no varnames to write to cleanup file")
         return
 
-    if not os.path.exists(cleanup_file):
+    try:
+        cleanup_file_stat = os.stat(cleanup_file)
+    except FileNotFoundError:
+        cleanup_file_stat = None
+
+    if cleanup_file_stat is None:
         if not create:
             raise FileNotFoundError(f'"{cleanup_file}" does not exist!')
         print_debug(f'cleanup file "{cleanup_file}" does not exist')
         os.makedirs(os.path.dirname(cleanup_file), exist_ok=True)
 
         # write new file
-        with open(cleanup_file, "w", encoding="UTF-8") as open_cleanup_file:
-            open_cleanup_file.write("\n".join(sorted(varnames)) + "\n")
+        write_mode = "wb"
+        varnames = sorted(varnames)
 
-    elif not os.path.isfile(cleanup_file):
+    elif not stat.S_ISREG(cleanup_file_stat.st_mode):
         raise OSError(f'"{cleanup_file}" is not a file!')
 
     else:
@@ -2378,20 +2562,22 @@ def append_to_cleanup_file(varnames, skip_always_cleanup=False, create=True):
         # subtract existing
         varnames = sorted(varnames - current_cleanup_varnames)
 
-        # append new
-        if varnames:
-            print_debug("appending to cleanup file", varnames)
-            with open(cleanup_file, "a", encoding="UTF-8") as open_cleanup_file:
-                open_cleanup_file.write("\n".join(sorted(varnames)) + "\n")
-
-        else:
+        if not varnames:
             print_debug("no new varnames to append to cleanup file")
             return
 
+        # append new
+        print_debug("appending to cleanup file", varnames)
+        write_mode = "ab"
+
+    # varnames are already validated as shell var names, so they are ASCII
+    with open(cleanup_file, write_mode) as open_cleanup_file:
+        open_cleanup_file.write(("\n".join(varnames) + "\n").encode("ascii"))
+
     # print message about future env cleanup
     cleanup_varnames_msg = (
         "Marking variables for later cleanup from systemd user manager on stop:\n  "
-        + "\n  ".join(sorted(varnames))
+        + "\n  ".join(varnames)
     )
     print_normal(cleanup_varnames_msg)
 
@@ -2409,7 +2595,9 @@ def finalize(additional_vars=None):
     if additional_vars is None:
         additional_vars = []
 
-    if not os.getenv("WAYLAND_DISPLAY", ""):
+    env = os.environ
+
+    if not env.get("WAYLAND_DISPLAY", ""):
         raise ValueError(
             "WAYLAND_DISPLAY is not defined or empty. Are we being run by a wayland compositor or not?"
         )
@@ -2427,13 +2615,14 @@ def finalize(additional_vars=None):
         else:
             if not filter_varnames(var):
                 continue
-            value = os.getenv(var, None)
-        if value is not None and var not in export_vars_names:
+            value = env.get(var, None)
+        # export_vars holds the same names as export_vars_names, check dict keys
+        if value is not None and var not in export_vars:
             export_vars.update({var: value})
             export_vars_names.append(var)
 
     # reuse dbus connection
-    bus_session = DbusInteractions("session")
+    bus_session = get_bus("session")
     print_debug("bus_session initial", bus_session)
 
     # get id of active or activating compositor
@@ -2463,10 +2652,11 @@ def finalize(additional_vars=None):
 
     set_systemd_vars(export_vars, bus_session=bus_session)
 
-    # if no prior failures and unit is in activating state, exec systemd-notify
+    # if no prior failures and unit is in activating state, notify systemd
     if activating_wm_id:
         print_normal(f"Declaring unit for {wm_id} ready.")
-        os.execlp("systemd-notify", "systemd-notify", "--ready")
+        notify_ready()
+        sys.exit(0)
     else:
         print_normal(f"Unit for {wm_id} is already active.")
         sys.exit(0)
@@ -2476,6 +2666,43 @@ def finalize(additional_vars=None):
     sys.exit(1)
 
 
+def notify_ready():
+    """
+    Sends READY=1 to systemd via NOTIFY_SOCKET directly, sparing systemd-notify exec.
+    Then waits on BARRIER=1 like systemd-notify does, so systemd processes READY=1
+    while this process still exists to be mapped to the unit.
+    Falls back to exec of systemd-notify if NOTIFY_SOCKET is not set.
+    """
+    notify_socket = os.getenv("NOTIFY_SOCKET", "")
+    if not notify_socket or notify_socket[0] not in ("/", "@"):
+        print_debug(f"unusable NOTIFY_SOCKET {notify_socket!r}, exec systemd-notify")
+        os.execlp("systemd-notify", "systemd-notify", "--ready")
+    # abstract namespace socket
+    if notify_socket[0] == "@":
+        notify_socket = "\0" + notify_socket[1:]
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as notify_sock:
+        notify_sock.connect(notify_socket)
+        notify_sock.sendall(b"READY=1")
+        print_debug("sent READY=1 to NOTIFY_SOCKET")
+        # barrier: systemd closes the passed write end after processing
+        # all preceding messages, which hangs up the read end
+        barrier_r, barrier_w = os.pipe()
+        try:
+            socket.send_fds(notify_sock, [b"BARRIER=1"], [barrier_w])
+            os.close(barrier_w)
+            barrier_w = None
+            barrier_poll = poll()
+            barrier_poll.register(barrier_r, POLLIN)
+            if not barrier_poll.poll(5000):
+                print_warning("Timed out waiting for notification barrier")
+            else:
+                print_debug("notification barrier passed")
+        finally:
+            os.close(barrier_r)
+            if barrier_w is not None:
+                os.close(barrier_w)
+
+
 def save_env(filename: str, env: dict = None):
     "Saves environment to a null-separated runtime file"
     if env is None:
@@ -2503,7 +2730,7 @@ def load_env(filename: str, delete: bool = False) -> dict:
         env_raw = sane_split(env_raw, "\0")
         for string in env_raw:
             var, value = string.split("=", maxsplit=1)
-            env.update({var: value})
+            env[var] = value
         env = filter_varnames(env)
         print_debug("loaded env", env)
     except Exception as caught_exception:
@@ -2520,23 +2747,15 @@ def load_env(filename: str, delete: bool = False) -> dict:
 def get_fg_vt() -> int:
     "Returns number of foreground VT or None"
     try:
-        with open(
-            "/sys/class/tty/tty0/active", "r", encoding="UTF-8"
-        ) as active_tty_attr:
+        with open("/sys/class/tty/tty0/active", "rb") as active_tty_attr:
             fgvt = active_tty_attr.read()
-        fgvt = fgvt.strip()
-        if not fgvt.startswith("tty"):
-            print_error(
-                f'Reading "/sys/class/tty/tty0/active" returned "{fgvt}", expected "tty[0-9]"!'
-            )
-            return None
-        fgvt_num = fgvt.removeprefix("tty")
-        if not fgvt_num.isnumeric():
+        fgvt_match = Val.active_tty.match(fgvt)
+        if fgvt_match is None:
             print_error(
-                f'Reading "/sys/class/tty/tty0/active" returned "{fgvt}", could not extract number!'
+                f'Reading "/sys/class/tty/tty0/active" returned "{fgvt.decode(errors="replace").strip()}", expected "tty[0-9]"!'
             )
             return None
-        return int(fgvt_num)
+        return int(fgvt_match.group(1))
     except Exception as caught_exception:
         print_error(caught_exception)
         return None
@@ -2555,7 +2774,7 @@ def get_session_by_vt(vtnr: int, verbose: bool = False):
         return None
 
     # get session list
-    bus_system = DbusInteractions("system")
+    bus_system = get_bus("system")
     for (
         session_id,
         _user_id,
@@ -2583,6 +2802,168 @@ def get_session_by_vt(vtnr: int, verbose: bool = False):
     return None
 
 
+def find_plugins(bin_id: str) -> List[str]:
+    "Returns list of plugin paths for bin_id from XDG data hierarchy, memoized per process"
+    if bin_id not in Plugins.paths:
+        Plugins.paths[bin_id] = list(
+            BaseDirectory.load_data_paths(f"uwsm/plugins/{bin_id}.sh")
+        )
+        print_debug(f"found plugins for {bin_id}", Plugins.paths[bin_id])
+    return Plugins.paths[bin_id]
+
+
+# static part of env preloader shell code
+ENV_PRELOADER_SH_BODY = dedent(
+    r"""
+    reverse() {
+    	# returns list $1 delimited by ${2:-:} in reverese
+    	__REVERSE_OUT__=''
+    	IFS="${2:-:}"
+    	for __ITEM__ in $1; do
+    		if [ -n "${__ITEM__}" ]; then
+    			__REVERSE_OUT__="${__ITEM__}${__REVERSE_OUT__:+$IFS}${__REVERSE_OUT__}"
+    		fi
+    	done
+    	printf '%s' "${__REVERSE_OUT__}"
+    	unset __REVERSE_OUT__
+    	IFS="${__OIFS__}"
+    }
+
+    lowercase() {
+    	# returns lowercase string
+    	echo "$1" | tr '[:upper:]' '[:lower:]'
+    }
+
+    source_file() {
+    	# sources file if exists, with messaging
+    	if [ -f "${1}" ]; then
+    		if [ -r "${1}" ]; then
+    			echo "Loading environment from \"${1}\"."
+    			. "${1}"
+    		else
+    			"Environment file ${1} is not readable" >&2
+    		fi
+    	fi
+    }
+
+    get_all_config_dirs() {
+    	# returns whole XDG_CONFIG hierarchy, :-delimited
+    	printf '%s' "${XDG_CONFIG_HOME}:${XDG_CONFIG_DIRS}"
+    }
+
+    get_all_config_dirs_extended() {
+    	# returns whole XDG_CONFIG and system XDG_DATA hierarchies, :-delimited
+    	printf '%s' "${XDG_CONFIG_HOME}:${XDG_CONFIG_DIRS}:${XDG_DATA_DIRS}"
+    }
+
+    in_each_config_dir() {
+    	# called for each config dir (decreasing priority)
+    	true
+    }
+
+    in_each_config_dir_reversed() {
+    	# called for each config dir in reverse (increasing priority)
+
+    	# compose sequence of env files from lowercase desktop names in reverse
+    	# (subshells are costly, so only when XDG_CURRENT_DESKTOP differs from previous call)
+    	if [ "${__ENV_FILES_XCD__+set}" != "set" ] || [ "${__ENV_FILES_XCD__}" != "${XDG_CURRENT_DESKTOP}" ]; then
+    		IFS=':'
+    		__ENV_FILES__=''
+    		for __DNLC__ in $(lowercase "$(reverse "${XDG_CURRENT_DESKTOP}")"); do
+    			IFS="${__OIFS__}"
+    			__ENV_FILES__="${__SELF_NAME__}/env-${__DNLC__}${__ENV_FILES__:+:}${__ENV_FILES__}"
+    		done
+    		# add common env file at the beginning
+    		__ENV_FILES__="${__SELF_NAME__}/env${__ENV_FILES__:+:}${__ENV_FILES__}"
+    		__ENV_FILES_XCD__="${XDG_CURRENT_DESKTOP}"
+    		unset __DNLC__
+    	fi
+
+    	# load env file sequence from this config dir rung
+    	IFS=':'
+    	for __ENV_FILE__ in ${__ENV_FILES__}; do
+    		source_file "${1}/${__ENV_FILE__}"
+    	done
+    	unset __ENV_FILE__
+    	IFS="${__OIFS__}"
+    }
+
+    process_config_dirs() {
+    	# iterate over config dirs (decreasing importance) and call in_each_config_dir* functions
+    	IFS=":"
+    	for __CONFIG_DIR__ in $(get_all_config_dirs_extended); do
+    		IFS="${__OIFS__}"
+    		if type "in_each_config_dir_${__WM_BIN_ID__}" >/dev/null 2>&1; then
+    			"in_each_config_dir_${__WM_BIN_ID__}" "${__CONFIG_DIR__}" || return $?
+    		else
+    			in_each_config_dir "${__CONFIG_DIR__}" || return $?
+    		fi
+    	done
+    	unset __CONFIG_DIR__
+    	IFS="${__OIFS__}"
+    	return 0
+    }
+
+    process_config_dirs_reversed() {
+    	# iterate over reverse config dirs (increasing importance) and call in_each_config_dir_reversed* functions
+    	IFS=":"
+    	for __CONFIG_DIR__ in $(reverse "$(get_all_config_dirs_extended)"); do
+    		IFS="${__OIFS__}"
+    		if type "in_each_config_dir_reversed_${__WM_BIN_ID__}" >/dev/null 2>&1; then
+    			"in_each_config_dir_reversed_${__WM_BIN_ID__}" "${__CONFIG_DIR__}" || return $?
+    		else
+    			in_each_config_dir_reversed "${__CONFIG_DIR__}" || return $?
+    		fi
+    	done
+    	unset __CONFIG_DIR__
+    	IFS="${__OIFS__}"
+    	return 0
+    }
+
+    load_wm_env() {
+    	# calls reverse config dir processing
+    	if type "process_config_dirs_reversed_${__WM_BIN_ID__}" >/dev/null 2>&1; then
+    		"process_config_dirs_reversed_${__WM_BIN_ID__}" || return $?
+    	else
+    		process_config_dirs_reversed
+    	fi
+    }
+
+    #### Basic environment
+    [ -f /etc/profile ] && . /etc/profile
+    [ -f "${HOME}/.profile" ] && . "${HOME}/.profile"
+    export PATH
+    export XDG_CONFIG_DIRS="${XDG_CONFIG_DIRS:-/etc/xdg}"
+    export XDG_CONFIG_HOME="${XDG_CONFIG_HOME:-${HOME}/.config}"
+    export XDG_DATA_DIRS="${XDG_DATA_DIRS:-/usr/local/share:/usr/share}"
+    export XDG_DATA_HOME="${XDG_DATA_HOME:-${HOME}/.local/share}"
+    export XDG_CACHE_HOME="${XDG_CACHE_HOME:-${HOME}/.cache}"
+    export XDG_RUNTIME_DIR="${XDG_RUNTIME_DIR:-/run/user/${__UID__}}"
+
+    export XDG_CURRENT_DESKTOP="${__WM_DESKTOP_NAMES__}"
+    export XDG_SESSION_DESKTOP="${__WM_FIRST_DESKTOP_NAME__}"
+    export XDG_MENU_PREFIX="${__WM_FIRST_DESKTOP_NAME__}-"
+
+    export XDG_SESSION_TYPE="wayland"
+    export XDG_BACKEND="wayland"
+
+    #### apply quirks
+    if type "quirks_${__WM_BIN_ID__}" >/dev/null 2>&1; then
+    	echo "Applying quirks for \"${__WM_BIN_ID__}\"."
+    	"quirks_${__WM_BIN_ID__}" || exit $?
+    fi
+
+    #### load env files
+    if type "load_wm_env_${__WM_BIN_ID__}" >/dev/null 2>&1; then
+    	"load_wm_env_${__WM_BIN_ID__}" || exit $?
+    else
+    	load_wm_env || exit $?
+    	true
+    fi
+    """
+)
+
+
 def prepare_env_gen_sh(random_mark):
     """
     Takes a known random string, returns string with shell code for sourcing env.
@@ -2601,15 +2982,14 @@ def prepare_env_gen_sh(random_mark):
         __WM_FIRST_DESKTOP_NAME__={shlex.quote(CompGlobals.desktop_names[0])}
         __WM_DESKTOP_NAMES_EXCLUSIVE__={'true' if CompGlobals.cli_desktop_names_exclusive else 'false'}
         __OIFS__=" \t\n"
+        __UID__={os.getuid()}
         # context marker for profile scripting
         IN_UWSM_ENV_PRELOADER=true
         """
     )
 
     # bake plugin loading into shell code
-    shell_plugins = BaseDirectory.load_data_paths(
-        f"uwsm/plugins/{CompGlobals.bin_id}.sh"
-    )
+    shell_plugins = find_plugins(CompGlobals.bin_id)
     shell_plugins_load = []
     for plugin in shell_plugins:
         shell_plugins_load.append(
@@ -2622,154 +3002,6 @@ def prepare_env_gen_sh(random_mark):
         )
     shell_plugins_load = "".join(shell_plugins_load)
 
-    # static part
-    shell_main_body = dedent(
-        r"""
-        reverse() {
-        	# returns list $1 delimited by ${2:-:} in reverese
-        	__REVERSE_OUT__=''
-        	IFS="${2:-:}"
-        	for __ITEM__ in $1; do
-        		if [ -n "${__ITEM__}" ]; then
-        			__REVERSE_OUT__="${__ITEM__}${__REVERSE_OUT__:+$IFS}${__REVERSE_OUT__}"
-        		fi
-        	done
-        	printf '%s' "${__REVERSE_OUT__}"
-        	unset __REVERSE_OUT__
-        	IFS="${__OIFS__}"
-        }
-
-        lowercase() {
-        	# returns lowercase string
-        	echo "$1" | tr '[:upper:]' '[:lower:]'
-        }
-
-        source_file() {
-        	# sources file if exists, with messaging
-        	if [ -f "${1}" ]; then
-        		if [ -r "${1}" ]; then
-        			echo "Loading environment from \"${1}\"."
-        			. "${1}"
-        		else
-        			"Environment file ${1} is not readable" >&2
-        		fi
-        	fi
-        }
-
-        get_all_config_dirs() {
-        	# returns whole XDG_CONFIG hierarchy, :-delimited
-        	printf '%s' "${XDG_CONFIG_HOME}:${XDG_CONFIG_DIRS}"
-        }
-
-        get_all_config_dirs_extended() {
-        	# returns whole XDG_CONFIG and system XDG_DATA hierarchies, :-delimited
-        	printf '%s' "${XDG_CONFIG_HOME}:${XDG_CONFIG_DIRS}:${XDG_DATA_DIRS}"
-        }
-
-        in_each_config_dir() {
-        	# called for each config dir (decreasing priority)
-        	true
-        }
-
-        in_each_config_dir_reversed() {
-        	# called for each config dir in reverse (increasing priority)
-
-        	# compose sequence of env files from lowercase desktop names in reverse
-        	IFS=':'
-        	__ENV_FILES__=''
-        	for __DNLC__ in $(lowercase "$(reverse "${XDG_CURRENT_DESKTOP}")"); do
-        		IFS="${__OIFS__}"
-        		__ENV_FILES__="${__SELF_NAME__}/env-${__DNLC__}${__ENV_FILES__:+:}${__ENV_FILES__}"
-        	done
-        	# add common env file at the beginning
-        	__ENV_FILES__="${__SELF_NAME__}/env${__ENV_FILES__:+:}${__ENV_FILES__}"
-        	unset __DNLC__
-
-        	# load env file sequence from this config dir rung
-        	IFS=':'
-        	for __ENV_FILE__ in ${__ENV_FILES__}; do
-        		source_file "${1}/${__ENV_FILE__}"
-        	done
-        	unset __ENV_FILE__
-        	unset __ENV_FILES__
-        	IFS="${__OIFS__}"
-        }
-
-        process_config_dirs() {
-        	# iterate over config dirs (decreasing importance) and call in_each_config_dir* functions
-        	IFS=":"
-        	for __CONFIG_DIR__ in $(get_all_config_dirs_extended); do
-        		IFS="${__OIFS__}"
-        		if type "in_each_config_dir_${__WM_BIN_ID__}" >/dev/null 2>&1; then
-        			"in_each_config_dir_${__WM_BIN_ID__}" "${__CONFIG_DIR__}" || return $?
-        		else
-        			in_each_config_dir "${__CONFIG_DIR__}" || return $?
-        		fi
-        	done
-        	unset __CONFIG_DIR__
-        	IFS="${__OIFS__}"
-        	return 0
-        }
-
-        process_config_dirs_reversed() {
-        	# iterate over reverse config dirs (increasing importance) and call in_each_config_dir_reversed* functions
-        	IFS=":"
-        	for __CONFIG_DIR__ in $(reverse "$(get_all_config_dirs_extended)"); do
-        		IFS="${__OIFS__}"
-        		if type "in_each_config_dir_reversed_${__WM_BIN_ID__}" >/dev/null 2>&1; then
-        			"in_each_config_dir_reversed_${__WM_BIN_ID__}" "${__CONFIG_DIR__}" || return $?
-        		else
-        			in_each_config_dir_reversed "${__CONFIG_DIR__}" || return $?
-        		fi
-        	done
-        	unset __CONFIG_DIR__
-        	IFS="${__OIFS__}"
-        	return 0
-        }
-
-        load_wm_env() {
-        	# calls reverse config dir processing
-        	if type "process_config_dirs_reversed_${__WM_BIN_ID__}" >/dev/null 2>&1; then
-        		"process_config_dirs_reversed_${__WM_BIN_ID__}" || return $?
-        	else
-        		process_config_dirs_reversed
-        	fi
-        }
-
-        #### Basic environment
-        [ -f /etc/profile ] && . /etc/profile
-        [ -f "${HOME}/.profile" ] && . "${HOME}/.profile"
-        export PATH
-        export XDG_CONFIG_DIRS="${XDG_CONFIG_DIRS:-/etc/xdg}"
-        export XDG_CONFIG_HOME="${XDG_CONFIG_HOME:-${HOME}/.config}"
-        export XDG_DATA_DIRS="${XDG_DATA_DIRS:-/usr/local/share:/usr/share}"
-        export XDG_DATA_HOME="${XDG_DATA_HOME:-${HOME}/.local/share}"
-        export XDG_CACHE_HOME="${XDG_CACHE_HOME:-${HOME}/.cache}"
-        export XDG_RUNTIME_DIR="${XDG_RUNTIME_DIR:-/run/user/$(id -u)}"
-
-        export XDG_CURRENT_DESKTOP="${__WM_DESKTOP_NAMES__}"
-        export XDG_SESSION_DESKTOP="${__WM_FIRST_DESKTOP_NAME__}"
-        export XDG_MENU_PREFIX="${__WM_FIRST_DESKTOP_NAME__}-"
-
-        export XDG_SESSION_TYPE="wayland"
-        export XDG_BACKEND="wayland"
-
-        #### apply quirks
-        if type "quirks_${__WM_BIN_ID__}" >/dev/null 2>&1; then
-        	echo "Applying quirks for \"${__WM_BIN_ID__}\"."
-        	"quirks_${__WM_BIN_ID__}" || exit $?
-        fi
-
-        #### load env files
-        if type "load_wm_env_${__WM_BIN_ID__}" >/dev/null 2>&1; then
-        	"load_wm_env_${__WM_BIN_ID__}" || exit $?
-        else
-        	load_wm_env || exit $?
-        	true
-        fi
-        """
-    )
-
     # pass env after the mark
     shell_print_env = dedent(
         f"""
@@ -2783,7 +3015,7 @@ def prepare_env_gen_sh(random_mark):
             *(["set -x\n"] if DebugFlag.debug else []),
             shell_definitions,
             shell_plugins_load,
-            shell_main_body,
+            ENV_PRELOADER_SH_BODY,
             *(["set +x\n"] if DebugFlag.debug else []),
             shell_print_env,
         ]
@@ -2801,26 +3033,29 @@ def filter_varnames(data):
     """
     if not isinstance(data, (dict, set, list, tuple, str)):
         raise TypeError(f"Expected dict|set|list|tuple, received {type(data)}")
-    drop_sh_vars = ["_", "SHELL", "PWD", "OLDWD"]
+    drop_sh_vars = {"_", "SHELL", "PWD", "OLDWD"}
+    # bound once for loops over whole environments
+    varname_fullmatch = Val.sh_varname.fullmatch
 
     if isinstance(data, str):
         if data in drop_sh_vars:
             print_debug(f"Dropped {data} var")
             return None
-        if not Val.sh_varname.search(data):
+        if not varname_fullmatch(data):
             print_warning(f'Encountered illegal var "{data}".')
             return None
         else:
             return data
 
     if isinstance(data, dict):
-        for var in list(data.keys()):
+        for var in [
+            var for var in data if var in drop_sh_vars or not varname_fullmatch(var)
+        ]:
             if var in drop_sh_vars:
                 print_debug(f"Dropped {var} var")
-                data.pop(var)
-            elif not Val.sh_varname.search(var):
+            else:
                 print_warning(f'Encountered illegal var "{var}".')
-                data.pop(var)
+            data.pop(var)
         return data
 
     if isinstance(data, (set, list, tuple)):
@@ -2828,20 +3063,246 @@ def filter_varnames(data):
         for var in data:
             if var in drop_sh_vars:
                 print_debug(f"Dropped {var} var")
-            elif not Val.sh_varname.search(var):
+            elif not varname_fullmatch(var):
                 print_warning(f'Encountered illegal var "{var}".')
             else:
                 new_data.append(var)
-        if isinstance(data, set):
-            return set(new_data)
-        if isinstance(data, tuple):
-            return tuple(new_data)
         if isinstance(data, list):
             return new_data
+        return type(data)(new_data)
 
     raise RuntimeError(f'Should not get here with data "{data}" ({type(data)})')
 
 
+def run_env_preloader(env_pre: dict) -> dict:
+    "Runs shell code with env_pre environment, returns filtered resulting env"
+    random_mark = f"MARK_{random_hex(16)}_MARK"
+    shell_code = prepare_env_gen_sh(random_mark)
+
+    sh_path = which("sh")
+    if not sh_path:
+        print_error('"sh" is not in PATH!')
+        sys.exit(1)
+
+    # run in binary mode, only messages and vars are decoded
+    sprc = subprocess.run(
+        [sh_path, "-"],
+        input=shell_code.encode("UTF-8"),
+        capture_output=True,
+        env=env_pre,
+        check=False,
+    )
+    print_debug(sprc)
+
+    # cut everything before and including random mark, also the last \0
+    # treat stdout before the mark as messages
+    mark_position = sprc.stdout.find(random_mark.encode("UTF-8"))
+    if mark_position < 0:
+        # print whole stdout
+        if sprc.stdout.strip():
+            print_normal(sprc.stdout.decode("UTF-8", errors="replace").strip())
+        # print any stderr as errors
+        if sprc.stderr.strip():
+            print_error(sprc.stderr.decode("UTF-8", errors="replace").strip())
+        raise RuntimeError(
+            f'Env output mark "{random_mark}" not found in shell output!'
+        )
+
+    stdout_msg = sprc.stdout[0:mark_position].strip()
+    stdout = sprc.stdout[mark_position + len(random_mark) :].rstrip(b"\0")
+
+    # print stdout if any
+    if stdout_msg:
+        print_normal(stdout_msg.decode("UTF-8", errors="replace"))
+    # print any stderr as errors
+    if sprc.stderr.strip():
+        print_error(sprc.stderr.decode("UTF-8", errors="replace").strip())
+
+    if sprc.returncode != 0:
+        raise RuntimeError(f"Shell returned {sprc.returncode}!")
+
+    # parse env
+    env_post = {}
+    for env in stdout.split(b"\0"):
+        var, sep, value = env.partition(b"=")
+        if sep and var != b"_":
+            # do not export mangled values, skip what does not decode
+            try:
+                env_post[var.decode("UTF-8")] = value.decode("UTF-8")
+            except UnicodeDecodeError:
+                print_warning(
+                    f'Skipping var "{var.decode("UTF-8", errors="replace")}" with undecodable name or value!'
+                )
+        else:
+            print_error(f"No value: {env.decode('UTF-8', errors='replace')}!")
+    return filter_varnames(env_post)
+
+
+def use_env_cache() -> bool:
+    "Checks UWSM_ENV_CACHE env var"
+    env_cache = os.getenv("UWSM_ENV_CACHE", "false")
+    if env_cache not in ("true", "false"):
+        print_warning(
+            f'invalid UWSM_ENV_CACHE value "{env_cache}" ignored, set to "false".'
+        )
+    return env_cache == "true"
+
+
+@functools.lru_cache(maxsize=None)
+def get_env_cache_base() -> Optional[bytes]:
+    """
+    Returns hash of env-independent inputs of env preloader shell output:
+    version, generated shell code, stats of sourced files.
+    Returns None if inputs can not be examined (env cache is not used then).
+    Computed once per process, both check_env_prepared() and prepare_env() need it.
+    """
+    paths = ["/etc/profile", os.path.join(os.path.expanduser("~"), ".profile")]
+    key = hashlib.sha256()
+    key.update(f"{PROJECT_VERSION}\0{prepare_env_gen_sh('')}\0".encode("UTF-8"))
+    try:
+        if os.path.isdir("/etc/profile.d"):
+            paths.append("/etc/profile.d")
+            with os.scandir("/etc/profile.d") as entries:
+                paths.extend(sorted(entry.path for entry in entries))
+        paths.extend(find_plugins(CompGlobals.bin_id))
+        for config_dir in (
+            BaseDirectory.xdg_config_home,
+            *BaseDirectory.xdg_config_dirs,
+            *BaseDirectory.xdg_data_dirs,
+        ):
+            env_dir = os.path.join(config_dir, BIN_NAME)
+            if not os.path.isdir(env_dir):
+                continue
+            paths.append(env_dir)
+            with os.scandir(env_dir) as entries:
+                paths.extend(
+                    sorted(
+                        entry.path
+                        for entry in entries
+                        if entry.name == "env" or entry.name.startswith("env-")
+                    )
+                )
+
+        for path in paths:
+            try:
+                path_stat = os.stat(path)
+                key.update(
+                    f"{path};{path_stat.st_ino};{path_stat.st_mtime_ns};{path_stat.st_size}\0".encode(
+                        "UTF-8"
+                    )
+                )
+            except FileNotFoundError:
+                key.update(f"{path};\0".encode("UTF-8"))
+    except OSError as caught_exception:
+        print_warning(
+            f"Not using env cache, could not examine its inputs: {caught_exception}"
+        )
+        return None
+    print_debug(f"env cache base from {len(paths)} paths", key.hexdigest())
+    return key.digest()
+
+
+def get_env_cache_key(env_pre: dict) -> Optional[str]:
+    """
+    Returns hash of everything env preloader shell output depends on:
+    env-independent inputs (see get_env_cache_base()) and initial environment,
+    None if inputs can not be examined
+    """
+    base = get_env_cache_base()
+    if base is None:
+        return None
+    key = hashlib.sha256(base)
+    for var, value in sorted(env_pre.items()):
+        if var == "UWSM_ENV_DIGEST":
+            continue
+        key.update(f"{var}={value}\0".encode("UTF-8"))
+    print_debug("env cache key", key.hexdigest())
+    return key.hexdigest()
+
+
+def read_env_cache(key: str) -> Optional[dict]:
+    "Reads env from cache file {BIN_NAME}-env-{bin_id} if key matches, else returns None"
+    env_cache_path = os.path.join(
+        BaseDirectory.xdg_cache_home, f"{BIN_NAME}-env-{CompGlobals.bin_id}"
+    )
+    if not os.path.isfile(env_cache_path):
+        print_debug(f"no cache {env_cache_path}")
+        return None
+    print_debug(f"reading cache {env_cache_path}")
+    try:
+        with open(env_cache_path, "r", encoding="UTF-8") as env_cache_file:
+            cached_key, _, env_raw = env_cache_file.read().partition("\0")
+        if cached_key != key:
+            print_debug("cache key mismatch")
+            return None
+        env = {}
+        for string in sane_split(env_raw, "\0"):
+            var, value = string.split("=", maxsplit=1)
+            env[var] = value
+        return filter_varnames(env)
+    except Exception as caught_exception:
+        # just remove it if something is wrong
+        print_debug(f"Removing cache file {env_cache_path} due to: {caught_exception}")
+        os.remove(env_cache_path)
+    return None
+
+
+def write_env_cache(key: str, env: dict):
+    "Writes key and env to cache file {BIN_NAME}-env-{bin_id} (private, atomic)"
+    env_cache_path = os.path.join(
+        BaseDirectory.xdg_cache_home, f"{BIN_NAME}-env-{CompGlobals.bin_id}"
+    )
+    env_cache_tmp = f"{env_cache_path}.{os.getpid()}.tmp"
+    print_debug(f"writing cache {env_cache_path} ({len(env)} vars)")
+    try:
+        os.makedirs(BaseDirectory.xdg_cache_home, exist_ok=True)
+        with open(
+            os.open(env_cache_tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600),
+            "w",
+            encoding="UTF-8",
+        ) as env_cache_file:
+            env_cache_file.write(
+                "\0".join((key, *(f"{var}={value}" for var, value in env.items())))
+            )
+        os.replace(env_cache_tmp, env_cache_path)
+    except Exception as caught_exception:
+        # leave existing cache intact
+        print_debug(f"Failed to write cache file {env_cache_path}: {caught_exception}")
+        if os.path.isfile(env_cache_tmp):
+            os.remove(env_cache_tmp)
+
+
+def check_env_prepared(env_pre: dict, env_login: dict) -> bool:
+    """
+    Checks if activation environment still holds the result of previous run
+    with unchanged inputs: UWSM_ENV_DIGEST matches cache key of saved initial env,
+    cached env is exported, vars missing from it are unset.
+    """
+    if "UWSM_ENV_DIGEST" not in env_pre:
+        return False
+    env_pre_saved = load_env("env_pre")
+    if not env_pre_saved:
+        return False
+    env_cache_key = get_env_cache_key(env_pre_saved)
+    if env_cache_key is None or env_pre["UWSM_ENV_DIGEST"] != env_cache_key:
+        print_debug("env digest mismatch")
+        return False
+    env_post = read_env_cache(env_cache_key)
+    if env_post is None:
+        return False
+
+    expected_env = {**env_login, **env_post}
+    for var in Varnames.export_excluded:
+        expected_env.pop(var, None)
+    expected_unset = (
+        env_pre_saved.keys() - env_post.keys() - env_login.keys()
+    ) | Varnames.always_unset
+    if expected_unset & env_pre.keys():
+        print_debug("vars expected to be unset", expected_unset & env_pre.keys())
+        return False
+    return all(env_pre.get(var) == value for var, value in expected_env.items())
+
+
 def prepare_env():
     """
     Runs shell code to source native shell env fragments,
@@ -2853,7 +3314,7 @@ def prepare_env():
     print_normal(
         f"Preparing environment for {CompGlobals.name or CompGlobals.bin_name}..."
     )
-    bus_session = DbusInteractions("session")
+    bus_session = get_bus("session")
     print_debug("bus_session initial", bus_session)
 
     # get login session environment saved by uwsm start
@@ -2879,7 +3340,7 @@ def prepare_env():
             if v_term is None:
                 raise RuntimeError("Could not determine foreground VT")
             # update session environment
-            env_login.update({"XDG_VTNR": str(v_term)})
+            env_login["XDG_VTNR"] = str(v_term)
         else:
             v_term = int(env_login["XDG_VTNR"])
 
@@ -2887,116 +3348,81 @@ def prepare_env():
         session_vars = get_session_by_vt(v_term)
         if session_vars is None:
             raise RuntimeError("Could not determine session of foreground VT")
-        env_login.update(
-            {"XDG_SESSION_ID": session_vars[0], "XDG_SEAT": session_vars[1]}
-        )
+        env_login["XDG_SESSION_ID"], env_login["XDG_SEAT"] = session_vars
 
     # get current ENV from systemd user manager
     env_pre = filter_varnames(bus_session.get_systemd_vars())
     systemd_varnames = set(env_pre.keys())
 
+    # environment from previous run with the same inputs is still in place
+    if use_env_cache() and check_env_prepared(env_pre, env_login):
+        print_normal("Environment is already prepared with unchanged inputs.")
+        return
+
     # save initial systemd state for later restoration on cleanup
     save_env("env_pre", env_pre)
 
-    # Run shell code with env_pre environment to prepare env and print results
-    random_mark = f"MARK_{random_hex(16)}_MARK"
-    shell_code = prepare_env_gen_sh(random_mark)
-
-    sh_path = which("sh")
-    if not sh_path:
-        print_error('"sh" is not in PATH!')
-        sys.exit(1)
-
-    sprc = subprocess.run(
-        [sh_path, "-"],
-        text=True,
-        input=shell_code,
-        capture_output=True,
-        env=env_pre,
-        check=False,
-    )
-    print_debug(sprc)
-
-    # cut everything before and including random mark, also the last \0
-    # treat stdout before the mark as messages
-    mark_position = sprc.stdout.find(random_mark)
-    if mark_position < 0:
-        # print whole stdout
-        if sprc.stdout.strip():
-            print_normal(sprc.stdout.strip())
-        # print any stderr as errors
-        if sprc.stderr.strip():
-            print_error(sprc.stderr.strip())
-        raise RuntimeError(
-            f'Env output mark "{random_mark}" not found in shell output!'
-        )
-
-    stdout_msg = sprc.stdout[0:mark_position]
-    stdout = sprc.stdout[mark_position + len(random_mark) :].rstrip("\0")
-
-    # print stdout if any
-    if stdout_msg.strip():
-        print_normal(stdout_msg.strip())
-    # print any stderr as errors
-    if sprc.stderr.strip():
-        print_error(sprc.stderr.strip())
-
-    if sprc.returncode != 0:
-        raise RuntimeError(f"Shell returned {sprc.returncode}!")
-
-    # parse env
-    env_post = {}
-    for env in stdout.split("\0"):
-        env = env.split("=", maxsplit=1)
-        if len(env) == 2 and env[0] != "_":
-            env_post.update({env[0]: env[1]})
-        else:
-            print_error(f"No value: {env}!")
-    env_post = filter_varnames(env_post)
+    # reuse shell output from previous run if all its inputs are unchanged
+    env_cache_key = get_env_cache_key(env_pre) if use_env_cache() else None
+    env_post = read_env_cache(env_cache_key) if env_cache_key else None
+    if env_post is None:
+        env_post = run_env_preloader(env_pre)
+        if env_cache_key:
+            write_env_cache(env_cache_key, env_post)
+    else:
+        print_normal("Using cached environment (unchanged env files and profile).")
 
     # include vars from login session that are missing from env_post
     for var, value in env_login.items():
         if var not in env_post:
             print_debug(f'back-adding from login env: {var}="{value}"')
-            env_post.update({var: value})
+            env_post[var] = value
 
     ## Dict of vars to put into systemd user manager
     # raw difference dict between env_post and env_pre
-    set_env = dict(set(env_post.items()) - set(env_pre.items()))
+    set_env = {
+        var: value for var, value in env_post.items() if env_pre.get(var) != value
+    }
 
     print_debug("env_pre", env_pre)
     print_debug("env_post", env_post)
     print_debug("set_env", set_env)
 
     # add "always_export" vars from env_post to set_env
-    for var in sorted(
-        Varnames.always_export - Varnames.never_export - Varnames.always_unset
-    ):
+    for var in Varnames.export_forced:
         if var in env_post:
             print_debug(f'Forcing export of {var}="{env_post[var]}"')
-            set_env.update({var: env_post[var]})
+            set_env[var] = env_post[var]
 
     # remove "never_export" and "always_unset" vars from set_env
-    for var in Varnames.never_export | Varnames.always_unset:
+    for var in Varnames.export_excluded:
         if var in set_env:
             print_debug(f"Excluding export of {var}")
             set_env.pop(var)
 
+    # mark inputs of prepared environment for check_env_prepared()
+    if env_cache_key:
+        set_env["UWSM_ENV_DIGEST"] = env_cache_key
+
     # Set of varnames to remove from systemd user manager
     # raw reverse difference
-    unset_varnames = set(env_pre.keys()) - set(env_post.keys())
+    unset_varnames = env_pre.keys() - env_post.keys()
     # add "always_unset" vars
-    unset_varnames = unset_varnames | set(Varnames.always_unset)
+    unset_varnames = unset_varnames | Varnames.always_unset
     # leave only those that are defined in systemd user manager
     unset_varnames = unset_varnames & systemd_varnames
 
     # Set of vars to remove from systemd user manager on shutdown
-    cleanup_varnames = set(set_env.keys()) - Varnames.never_cleanup
+    cleanup_varnames = set_env.keys() - Varnames.never_cleanup
 
     # write cleanup file
     # first get exitsing vars if cleanup file already exists
     append_to_cleanup_file(cleanup_varnames, create=True)
 
+    if not set_env and not unset_varnames:
+        print_normal("Environment is already in sync.")
+        return
+
     # export env to systemd user manager
     set_systemd_vars(set_env, bus_session=bus_session)
 
@@ -3017,45 +3443,45 @@ def cleanup_env():
     """
 
     print_normal("Cleaning up...")
-    bus_session = DbusInteractions("session")
+    bus_session = get_bus("session")
     print_debug("bus_session initial", bus_session)
 
     cleanup_file_dir = os.path.join(
         BaseDirectory.get_runtime_dir(strict=True), BIN_NAME
     )
     cleanup_files = []
+    current_cleanup_varnames = set()
 
     # TODO leave only env_cleanup.list after a few releases
     if os.path.isdir(cleanup_file_dir):
-        for cleanup_file in os.listdir(cleanup_file_dir):
-            if not (
-                cleanup_file == "env_cleanup.list"
-                or (
-                    cleanup_file.startswith("env_cleanup_")
-                    and cleanup_file.endswith(".list")
-                )
-            ):
-                continue
-            cleanup_file = os.path.join(cleanup_file_dir, cleanup_file)
-            if os.path.isfile(cleanup_file):
-                print_normal(f'Found cleanup file "{os.path.basename(cleanup_file)}".')
-                cleanup_files.append(cleanup_file)
+        with os.scandir(cleanup_file_dir) as cleanup_dir_entries:
+            for cleanup_dir_entry in cleanup_dir_entries:
+                if not (
+                    cleanup_dir_entry.name == "env_cleanup.list"
+                    or (
+                        cleanup_dir_entry.name.startswith("env_cleanup_")
+                        and cleanup_dir_entry.name.endswith(".list")
+                    )
+                ):
+                    continue
+                if not cleanup_dir_entry.is_file():
+                    continue
+                print_normal(f'Found cleanup file "{cleanup_dir_entry.name}".')
+                cleanup_files.append(cleanup_dir_entry.path)
+                with open(
+                    cleanup_dir_entry.path, "r", encoding="UTF-8"
+                ) as open_cleanup_file:
+                    current_cleanup_varnames.update(
+                        l.strip() for l in open_cleanup_file if l.strip()
+                    )
 
     if not cleanup_files:
         print_warning("No cleanup files found.")
 
-    current_cleanup_varnames = set()
-    for cleanup_file in cleanup_files:
-        if os.path.isfile(cleanup_file):
-            with open(cleanup_file, "r", encoding="UTF-8") as open_cleanup_file:
-                current_cleanup_varnames = current_cleanup_varnames | {
-                    l.strip() for l in open_cleanup_file.readlines() if l.strip()
-                }
-
-    systemd_vars = bus_session.get_systemd_vars()
-    systemd_varnames = set(systemd_vars.keys())
+    systemd_varnames = bus_session.get_systemd_vars().keys()
 
     # load initial state, delete file later
+    env_pre = {}
     env_pre_file = os.path.join(
         BaseDirectory.get_runtime_dir(strict=True), BIN_NAME, "env_pre"
     )
@@ -3064,9 +3490,9 @@ def cleanup_env():
         env_pre = load_env("env_pre", delete=False)
 
     cleanup_varnames = (
-        ((current_cleanup_varnames | Varnames.always_cleanup) - Varnames.never_cleanup)
+        ((current_cleanup_varnames - Varnames.never_cleanup) | Varnames.cleanup_forced)
         & systemd_varnames
-    ) - set(env_pre.keys())
+    ) - env_pre.keys()
 
     if cleanup_varnames:
         # unset vars
@@ -3116,24 +3542,28 @@ def gen_entry_args(entry, args, entry_action=None):
 
     entry_args = []
 
+    # urified args for %u, %U, filled only when one of them is encountered
+    url_args = None
+
     ## search for fields to reappend, expand, or pop
 
-    # %[fFuU] recorder
+    # argument with %[fFuU] recorder
     encountered_fu = ""
-    # %[fu] index
+    # %[fu] field and index
+    encountered_field = ""
     encountered_fu_idx = None
 
     for idx, entry_arg in enumerate(entry_args_pre):
-        print_debug(f'parsing argument {idx + 1}: "{entry_arg}"')
-        if len(re.findall(r"(?!^|[^%])%[a-zA-Z]", entry_arg)) > 1:
+        print_debug("parsing argument", idx + 1, entry_arg)
+        if len(Val.entry_field.findall(entry_arg)) > 1:
             raise RuntimeError(f'More than one % field in argument: "{entry_arg}"')
 
         elif "%%" in entry_arg:
             new_arg = entry_arg.replace("%%", "%")
             entry_args.append(new_arg)
-            print_debug(f'replaced with "{new_arg}", appended: {entry_args}')
+            print_debug("replaced with", new_arg, "appended:", entry_args)
 
-        elif re.search(r"%[DdNnvm]", entry_arg):
+        elif Val.entry_field_deprecated.search(entry_arg):
             print_debug("dropped as deprecated")
 
         elif "%f" in entry_arg:
@@ -3142,20 +3572,21 @@ def gen_entry_args(entry, args, entry_action=None):
                     f'Desktop entry has conflicting args: "{encountered_fu}", "{entry_arg}"'
                 )
             encountered_fu = entry_arg
+            encountered_field = "%f"
             encountered_fu_idx = len(entry_args)
             print_debug(
-                f"marked encountered_fu_idx by refilled entry_args {len(entry_args)}"
+                "marked encountered_fu_idx by refilled entry_args", len(entry_args)
             )
 
             if len(args) == 0:
-                print_debug(f"popped, {entry_args}")
+                print_debug("popped,", entry_args)
             elif len(args) == 1:
                 new_arg = entry_arg.replace("%f", args[0])
                 entry_args.append(new_arg)
-                print_debug(f'replaced with "{new_arg}", appended: {entry_args}')
+                print_debug("replaced with", new_arg, "appended:", entry_args)
             else:
                 # leave field arg for later iterative replacement
-                print_debug(f"ignored, {entry_args}")
+                print_debug("ignored,", entry_args)
                 entry_args.append(entry_arg)
 
         elif entry_arg == "%F":
@@ -3166,9 +3597,8 @@ def gen_entry_args(entry, args, entry_action=None):
             encountered_fu = entry_arg
 
             # replace with arguments
-            for arg in args:
-                entry_args.append(arg)
-                print_debug(f'appended "{arg}", {entry_args}')
+            entry_args.extend(args)
+            print_debug("extended with args,", entry_args)
 
         elif "%F" in entry_arg:
             raise RuntimeError(f'Encountered "%F" inside argument: "{entry_arg}"')
@@ -3179,22 +3609,24 @@ def gen_entry_args(entry, args, entry_action=None):
                     f'Desktop entry has conflicting args: "{encountered_fu}", "{entry_arg}"'
                 )
             encountered_fu = entry_arg
+            encountered_field = "%u"
+            url_args = [path2url(arg) for arg in args]
             encountered_fu_idx = len(entry_args)
             print_debug(
-                f"marked encountered_fu_idx by refilled entry_args {len(entry_args)}"
+                "marked encountered_fu_idx by refilled entry_args", len(entry_args)
             )
 
             if len(args) == 0:
-                print_debug(f'popped "{entry_arg}", {entry_args}')
+                print_debug("popped", entry_arg, entry_args)
             elif len(args) == 1:
-                new_arg = entry_arg.replace("%u", path2url(args[0]))
+                new_arg = entry_arg.replace("%u", url_args[0])
                 entry_args.append(new_arg)
                 print_debug(
-                    f'replaced "{entry_arg}" => "{new_arg}", appended: {entry_args}'
+                    "replaced", entry_arg, "=>", new_arg, "appended:", entry_args
                 )
             else:
                 # leave field arg for later iterative replacement
-                print_debug(f'ignored "{entry_arg}", {entry_args}')
+                print_debug("ignored", entry_arg, entry_args)
                 entry_args.append(entry_arg)
 
         elif entry_arg == "%U":
@@ -3204,12 +3636,10 @@ def gen_entry_args(entry, args, entry_action=None):
                 )
             encountered_fu = entry_arg
 
-            # replace with arguments
-            for arg in args:
-                # urify if not an url, assume file
-                arg = path2url(arg)
-                entry_args.append(arg)
-                print_debug(f'appended "{arg}", {entry_args}')
+            # replace with urified arguments
+            url_args = [path2url(arg) for arg in args]
+            entry_args.extend(url_args)
+            print_debug("extended with urified args,", entry_args)
 
         elif "%U" in entry_arg:
             raise RuntimeError(f'Encountered "%U" inside argument: "{entry_arg}"')
@@ -3217,16 +3647,16 @@ def gen_entry_args(entry, args, entry_action=None):
         elif entry_arg == "%c":
             arg = entry_expand_str(entry.getName())
             entry_args.append(arg)
-            print_debug(f'replaced with "{arg}", {entry_args}')
+            print_debug("replaced with", arg, entry_args)
         elif entry_arg == "%k":
             arg = entry.getFileName()
             entry_args.append(arg)
-            print_debug(f'replaced, with "{arg}", {entry_args}')
+            print_debug("replaced with", arg, entry_args)
         elif entry_arg == "%i":
             if entry_dict["Icon"]:
                 arg = entry_dict["Icon"]
                 entry_args.extend(["--icon", arg])
-                print_debug(f'replaced with "--icon", "{arg}", {entry_args}')
+                print_debug("replaced with --icon", arg, entry_args)
             else:
                 print_debug("popped")
         else:
@@ -3247,15 +3677,13 @@ def gen_entry_args(entry, args, entry_action=None):
         )
 
     # iterative arguments required
-    if len(args) > 1 and encountered_fu in ["%f", "%u"]:
+    if len(args) > 1 and encountered_field:
         iterated_entry_args = []
-        for arg in args:
+        for arg in url_args if encountered_field == "%u" else args:
             cur_entry_args = entry_args.copy()
-            if encountered_fu == "%u":
-                arg = path2url(arg)
-            cur_entry_args[encountered_fu_idx] = cur_entry_args[
-                encountered_fu_idx
-            ].replace(encountered_fu, arg)
+            cur_entry_args[encountered_fu_idx] = encountered_fu.replace(
+                encountered_field, arg
+            )
             iterated_entry_args.append(cur_entry_args)
             print_debug("added iter args", cur_entry_args)
 
@@ -3264,6 +3692,39 @@ def gen_entry_args(entry, args, entry_action=None):
     return (entry_cmd, entry_args)
 
 
+def get_terminal_list_paths() -> List[str]:
+    "Returns paths of all candidate *xdg-terminals.list files in order of preference"
+    config_file_names = [
+        f"{desktop}-xdg-terminals.list" for desktop in get_current_desktops() if desktop
+    ] + ["xdg-terminals.list"]
+    return [
+        os.path.join(config_dir, config_file_name)
+        for config_dir in BaseDirectory.xdg_config_dirs
+        for config_file_name in config_file_names
+    ]
+
+
+def get_terminal_stamp() -> tuple:
+    """
+    Returns mtimes of terminal lists, applications dirs, and currently selected
+    terminal entry file, for detecting changes that could affect terminal choice.
+    Entries added to or removed from nested applications subdirs are not detected.
+    """
+    paths = [
+        *get_terminal_list_paths(),
+        *BaseDirectory.load_data_paths("applications"),
+    ]
+    if Terminal.entry is not None:
+        paths.append(Terminal.entry.filename)
+    stamp = []
+    for path in paths:
+        try:
+            stamp.append((path, os.stat(path).st_mtime))
+        except FileNotFoundError:
+            stamp.append((path, None))
+    return tuple(stamp)
+
+
 def find_terminal_entry():
     "Finds default terminal entry, returns tuple of (entry object, entry_id, entry_action) or (None, None, None)"
 
@@ -3272,69 +3733,88 @@ def find_terminal_entry():
     unexcluded_terminal_entries = []
 
     ## read configs, compose preferred terminal entry list
-    # iterate config dirs
-    for config_dir in BaseDirectory.xdg_config_dirs:
-        # iterate configs
-        for config_file in [
-            f"{desktop}-xdg-terminals.list"
-            for desktop in sane_split(os.getenv("XDG_CURRENT_DESKTOP", ""), ":")
-            if desktop
-        ] + ["xdg-terminals.list"]:
-            config_file = os.path.join(config_dir, config_file)
-            try:
-                with open(config_file, "r", encoding="UTF-8") as terminal_list:
-                    print_debug(f"reading {config_file}")
-                    for line in [line.strip() for line in terminal_list.readlines()]:
-                        if not line or line.startswith("#"):
-                            continue
-                        if line.startswith("-"):
-                            fbcontrol = -1
-                            line = line[1:]
-                        elif line.startswith("+"):
-                            fbcontrol = 1
-                            line = line[1:]
-                        else:
-                            fbcontrol = 0
-                        # be relaxed about line parsing
-                        # only valid entry.desktop[:action] lines are of interest
-                        try:
-                            arg = MainArg(line)
-                        except Exception:
-                            continue
-                        if not arg.entry_id or arg.path:
-                            continue
-                        if (
-                            fbcontrol == 0
-                            and (arg.entry_id, arg.entry_action) not in terminal_entries
-                        ):
-                            print_debug(f"got terminal entry {line}")
-                            terminal_entries.append((arg.entry_id, arg.entry_action))
-                        elif (
-                            fbcontrol == -1
-                            and not arg.entry_action
-                            and arg.entry_id
-                            not in excluded_terminal_entries
-                            + unexcluded_terminal_entries
-                        ):
-                            print_debug(f"got fallback exclusion for {line}")
-                            excluded_terminal_entries.append(arg.entry_id)
-                        elif (
-                            fbcontrol == 1
-                            and not arg.entry_action
-                            and arg.entry_id
-                            not in excluded_terminal_entries
-                            + unexcluded_terminal_entries
-                        ):
-                            print_debug(f"got fallback exclusion protection for {line}")
-                            unexcluded_terminal_entries.append(arg.entry_id)
-                        else:
-                            print_debug(
-                                f"ignored line { {-1: '-', 0: '', 1: '+'}[fbcontrol] }{line}"
-                            )
-            except FileNotFoundError:
-                pass
-            except Exception as caught_exception:
-                print_warning(caught_exception, notify=1)
+    config_files = get_terminal_list_paths()
+    config_mtimes = {}
+    for config_file in config_files:
+        try:
+            config_mtimes.update({config_file: os.stat(config_file).st_mtime})
+        except FileNotFoundError:
+            config_mtimes.update({config_file: 0.0})
+
+    # reuse parsed lists if config files are unchanged
+    terminal_lists = read_terminal_lists_cache(config_mtimes)
+    if terminal_lists is not None:
+        (
+            terminal_entries,
+            excluded_terminal_entries,
+            unexcluded_terminal_entries,
+        ) = terminal_lists
+        config_files = []
+    read_errors = False
+
+    # iterate configs
+    for config_file in config_files:
+        if not config_mtimes[config_file]:
+            continue
+        try:
+            with open(config_file, "r", encoding="UTF-8") as terminal_list:
+                print_debug(f"reading {config_file}")
+                for line in map(str.strip, terminal_list):
+                    if not line or line.startswith("#"):
+                        continue
+                    if line.startswith("-"):
+                        fbcontrol = -1
+                        line = line[1:]
+                    elif line.startswith("+"):
+                        fbcontrol = 1
+                        line = line[1:]
+                    else:
+                        fbcontrol = 0
+                    # be relaxed about line parsing
+                    # only valid entry.desktop[:action] lines are of interest
+                    try:
+                        arg = MainArg(line)
+                    except Exception:
+                        continue
+                    if not arg.entry_id or arg.path:
+                        continue
+                    if (
+                        fbcontrol == 0
+                        and (arg.entry_id, arg.entry_action) not in terminal_entries
+                    ):
+                        print_debug("got terminal entry", line)
+                        terminal_entries.append((arg.entry_id, arg.entry_action))
+                    elif (
+                        fbcontrol == -1
+                        and not arg.entry_action
+                        and arg.entry_id
+                        not in excluded_terminal_entries + unexcluded_terminal_entries
+                    ):
+                        print_debug("got fallback exclusion for", line)
+                        excluded_terminal_entries.append(arg.entry_id)
+                    elif (
+                        fbcontrol == 1
+                        and not arg.entry_action
+                        and arg.entry_id
+                        not in excluded_terminal_entries + unexcluded_terminal_entries
+                    ):
+                        print_debug("got fallback exclusion protection for", line)
+                        unexcluded_terminal_entries.append(arg.entry_id)
+                    else:
+                        print_debug(
+                            f"ignored line { {-1: '-', 0: '', 1: '+'}[fbcontrol] }{line}"
+                        )
+        except FileNotFoundError:
+            pass
+        except Exception as caught_exception:
+            read_errors = True
+            print_warning(caught_exception, notify=1)
+
+    if config_files and not read_errors:
+        write_terminal_lists_cache(
+            config_mtimes,
+            (terminal_entries, excluded_terminal_entries, unexcluded_terminal_entries),
+        )
 
     print_debug("explicit terminal_entries", terminal_entries)
 
@@ -3344,21 +3824,22 @@ def find_terminal_entry():
             "applications",
             parser=entry_parser_terminal,
             parser_args={"explicit_terminals": terminal_entries},
+            accept_ids={entry_id for entry_id, _ in terminal_entries},
         )
         print_debug(f"found {len(found_terminal_entries)} entries")
         # find first match in found terminals
+        found_terminal_entries = {
+            (terminal_entry_id, terminal_entry_action): terminal_entry
+            for terminal_entry, terminal_entry_id, terminal_entry_action in found_terminal_entries
+        }
         for entry_id, entry_action in terminal_entries:
-            for (
-                terminal_entry,
-                terminal_entry_id,
-                terminal_entry_action,
-            ) in found_terminal_entries:
-                if (entry_id, entry_action) == (
-                    terminal_entry_id,
-                    terminal_entry_action,
-                ):
-                    print_debug(f"found terminal {entry_id}:{entry_action}")
-                    return (terminal_entry, terminal_entry_id, terminal_entry_action)
+            if (entry_id, entry_action) in found_terminal_entries:
+                print_debug(f"found terminal {entry_id}:{entry_action}")
+                return (
+                    found_terminal_entries[(entry_id, entry_action)],
+                    entry_id,
+                    entry_action,
+                )
 
     print_debug("no explicit terminals matched, starting terminal entry search")
 
@@ -3390,8 +3871,10 @@ def read_neg_cache(name: str) -> dict:
         print_debug(f"reading cache {neg_cache_path}")
         try:
             with open(neg_cache_path, "r", encoding="UTF-8") as neg_cache_file:
-                for line in neg_cache_file.readlines():
-                    path, mtime = line.strip().split(";")
+                for line in neg_cache_file:
+                    path, sep, mtime = line.rstrip("\n").rpartition(";")
+                    if not sep:
+                        raise ValueError(f'Malformed line "{line.strip()}"')
                     out.update({path: float(mtime)})
         except Exception as caught_exception:
             # just remove it if something is wrong
@@ -3406,19 +3889,84 @@ def read_neg_cache(name: str) -> dict:
 
 
 def write_neg_cache(name: str, data: dict):
-    "Writes path;mtime to cache file {BIN_NAME}-{name}"
+    "Writes path;mtime to cache file {BIN_NAME}-{name} (atomic)"
     neg_cache_path = os.path.join(BaseDirectory.xdg_cache_home, f"{BIN_NAME}-{name}")
+    neg_cache_tmp = f"{neg_cache_path}.{os.getpid()}.tmp"
     print_debug(f"writing cache {neg_cache_path} ({len(data)} items)")
     try:
         os.makedirs(BaseDirectory.xdg_cache_home, exist_ok=True)
-        with open(neg_cache_path, "w", encoding="UTF-8") as neg_cache_file:
-            for path, mtime in data.items():
-                neg_cache_file.write(f"{path};{mtime}\n")
+        with open(neg_cache_tmp, "w", encoding="UTF-8") as neg_cache_file:
+            neg_cache_file.write(
+                "".join(f"{path};{mtime}\n" for path, mtime in data.items())
+            )
+        os.replace(neg_cache_tmp, neg_cache_path)
+    except Exception as caught_exception:
+        # leave existing cache intact
+        print_debug(f"Failed to write cache file {neg_cache_path}: {caught_exception}")
+        if os.path.isfile(neg_cache_tmp):
+            os.remove(neg_cache_tmp)
+
+
+def read_terminal_lists_cache(mtimes: dict) -> Optional[tuple]:
+    """
+    Reads parsed terminal lists from cache file {BIN_NAME}-xdg-terminals
+    Returns (terminal_entries, excluded_terminal_entries, unexcluded_terminal_entries)
+    if path to mtime mapping matches given, otherwise None
+    """
+    cache_path = os.path.join(BaseDirectory.xdg_cache_home, f"{BIN_NAME}-xdg-terminals")
+    if not os.path.isfile(cache_path):
+        print_debug(f"no cache {cache_path}")
+        return None
+    print_debug(f"reading cache {cache_path}")
+    try:
+        with open(cache_path, "r", encoding="UTF-8") as cache_file:
+            cache = json.load(cache_file)
+        if cache["mtimes"] != mtimes:
+            print_debug("cache is stale")
+            return None
+        return (
+            [tuple(entry) for entry in cache["terminal_entries"]],
+            cache["excluded_terminal_entries"],
+            cache["unexcluded_terminal_entries"],
+        )
     except Exception as caught_exception:
         # just remove it if something is wrong
-        print_debug(f"Removing cache file {neg_cache_path} due to: {caught_exception}")
-        if os.path.isfile(neg_cache_path):
-            os.remove(neg_cache_path)
+        print_debug(f"Removing cache file {cache_path} due to: {caught_exception}")
+        os.remove(cache_path)
+    return None
+
+
+def write_terminal_lists_cache(mtimes: dict, data: tuple):
+    "Writes path to mtime mapping and parsed terminal lists to cache file {BIN_NAME}-xdg-terminals (atomic)"
+    cache_path = os.path.join(BaseDirectory.xdg_cache_home, f"{BIN_NAME}-xdg-terminals")
+    cache_tmp = f"{cache_path}.{os.getpid()}.tmp"
+    print_debug(f"writing cache {cache_path}")
+    try:
+        os.makedirs(BaseDirectory.xdg_cache_home, exist_ok=True)
+        with open(cache_tmp, "w", encoding="UTF-8") as cache_file:
+            json.dump(
+                {
+                    "mtimes": mtimes,
+                    "terminal_entries": data[0],
+                    "excluded_terminal_entries": data[1],
+                    "unexcluded_terminal_entries": data[2],
+                },
+                cache_file,
+            )
+        os.replace(cache_tmp, cache_path)
+    except Exception as caught_exception:
+        # leave existing cache intact
+        print_debug(f"Failed to write cache file {cache_path}: {caught_exception}")
+        if os.path.isfile(cache_tmp):
+            os.remove(cache_tmp)
+
+
+# short slice names for app launcher
+SLICE_ALIASES = {
+    "a": "app-graphical.slice",
+    "b": "background-graphical.slice",
+    "s": "session-graphical.slice",
+}
 
 
 def app(
@@ -3489,14 +4037,7 @@ def app(
 
         # get localized entry name for description if no override
         if not unit_description:
-            unit_description = " - ".join(
-                n
-                for n in (
-                    entry_expand_str(entry.getName()),
-                    entry_expand_str(entry.getGenericName()),
-                )
-                if n
-            )
+            unit_description = entry_display_name(entry)
 
         # generate command and args according to entry
         cmd, cmd_args = gen_entry_args(
@@ -3514,8 +4055,6 @@ def app(
 
             # background processes container
             sub_apps = []
-            # poll registry container
-            sub_apps_rc = []
             # call forking self for each instance
             for args_instance in cmd_args:
                 cmdline_instance = [cmd] + args_instance
@@ -3534,32 +4073,43 @@ def app(
                         silent=silent,
                     )
                 )
-                # add placeholder for rc
-                sub_apps_rc.append(None)
 
             if return_cmdline:
                 return sub_apps
 
-            # function for map()
-            def is_int(checkvar):
-                "checks if given var is int"
-                return isinstance(checkvar, int)
-
-            # poll subprocesses until they are all finished
-            while not all(map(is_int, sub_apps_rc)):
-                for idx, sub_app in enumerate(sub_apps):
-                    if not is_int(sub_apps_rc[idx]):
-                        sub_apps_rc[idx] = sub_app.poll()
-                        if is_int(sub_apps_rc[idx]):
-                            proc_exit_msg = f'systemd-run for "{shlex.join(sub_app.args[sub_app.args.index("--") + 1:])}" returned {sub_apps_rc[idx]}.'
-                            if sub_apps_rc[idx] == 0:
-                                print_normal(proc_exit_msg)
-                            else:
-                                print_error(proc_exit_msg, notify=1)
-                time.sleep(0.1)
+            # wait for subprocesses in order of exit
+            # with app part of systemd-run command line for messages rendered beforehand
+            sub_apps_by_pid = {
+                sub_app.pid: (
+                    sub_app,
+                    shlex.join(sub_app.args[sub_app.args.index("--") + 1 :]),
+                )
+                for sub_app in sub_apps
+            }
+            any_failed = False
+            while sub_apps_by_pid:
+                try:
+                    pid, wait_status = os.waitpid(-1, 0)
+                except ChildProcessError:
+                    # reaped elsewhere, exit status is lost
+                    print_warning(
+                        f"Lost track of {len(sub_apps_by_pid)} systemd-run process(es)."
+                    )
+                    any_failed = True
+                    break
+                if pid not in sub_apps_by_pid:
+                    continue
+                sub_app, sub_app_cmdline = sub_apps_by_pid.pop(pid)
+                sub_app.returncode = os.waitstatus_to_exitcode(wait_status)
+                proc_exit_msg = f'systemd-run for "{sub_app_cmdline}" returned {sub_app.returncode}.'
+                if sub_app.returncode == 0:
+                    print_normal(proc_exit_msg)
+                else:
+                    any_failed = True
+                    print_error(proc_exit_msg, notify=1)
 
             # if there is any non-zero rc
-            if any(sub_apps_rc):
+            if any_failed:
                 sys.exit(1)
             sys.exit(0)
 
@@ -3580,23 +4130,29 @@ def app(
                 Terminal.entry_id,
                 Terminal.entry_action_id,
             ) = find_terminal_entry()
+            Terminal.execarg = None
 
         terminal_cmdline = entry_action_keys(Terminal.entry, Terminal.entry_action_id)[
             "Exec"
         ]
-        if Terminal.entry.hasKey("TerminalArgExec"):
-            terminal_execarg = Terminal.entry.get("TerminalArgExec")
-        elif Terminal.entry.hasKey("X-TerminalArgExec"):
-            terminal_execarg = Terminal.entry.get("X-TerminalArgExec")
-        elif Terminal.entry.hasKey("ExecArg"):
-            terminal_execarg = Terminal.entry.get("ExecArg")
-        elif Terminal.entry.hasKey("X-ExecArg"):
-            terminal_execarg = Terminal.entry.get("X-ExecArg")
-        else:
-            terminal_execarg = "-e"
-        terminal_execarg = (
-            [entry_expand_str(terminal_execarg)] if terminal_execarg else []
-        )
+        # resolve exec arg once per entry, first present key wins (even if empty)
+        if Terminal.execarg is None:
+            execarg_key = next(
+                (
+                    key
+                    for key in (
+                        "TerminalArgExec",
+                        "X-TerminalArgExec",
+                        "ExecArg",
+                        "X-ExecArg",
+                    )
+                    if Terminal.entry.hasKey(key)
+                ),
+                None,
+            )
+            execarg = Terminal.entry.get(execarg_key) if execarg_key else "-e"
+            Terminal.execarg = [entry_expand_str(execarg)] if execarg else []
+        terminal_execarg = Terminal.execarg
 
         # discard explicit -e or execarg for terminal
         # only if followed by something, otherwise it will error out on Command not found below
@@ -3609,21 +4165,14 @@ def app(
             if not app_name:
                 app_name = os.path.splitext(Terminal.entry_id)[0]
             if not unit_description:
-                unit_description = " - ".join(
-                    n
-                    for n in (
-                        entry_expand_str(Terminal.entry.getName()),
-                        entry_expand_str(Terminal.entry.getGenericName()),
-                    )
-                    if n
-                )
+                unit_description = entry_display_name(Terminal.entry)
             # cmdline contents should not be referenced until the end of this function,
             # where it will be starred into nothingness
             cmdline = []
             # remove exec arg
             terminal_execarg = []
     else:
-        terminal_cmdline, terminal_execarg, Terminal.entry_id = ([], [], "")
+        terminal_cmdline, terminal_execarg = ([], [])
 
     if not unit_description:
         unit_description = (
@@ -3632,26 +4181,20 @@ def app(
             else f"App launched by {BIN_NAME}"
         )
 
-    if cmdline and not which(cmdline[0]):
+    if cmdline and not which_cached(cmdline[0]):
         raise RuntimeError(f'Command not found: "{cmdline[0]}"')
 
-    if slice_name == "a":
-        slice_name = "app-graphical.slice"
-    elif slice_name == "b":
-        slice_name = "background-graphical.slice"
-    elif slice_name == "s":
-        slice_name = "session-graphical.slice"
-    elif slice_name.endswith(".slice"):
-        # slice_name = slice_name
-        pass
-    else:
+    if slice_name in SLICE_ALIASES:
+        slice_name = SLICE_ALIASES[slice_name]
+    elif not slice_name.endswith(".slice"):
         raise ValueError(f"Invalid slice name: {slice_name}!")
 
     if not unit_name:
         # use first XDG_CURRENT_DESKTOP as part of scope name
         # use app command as part of scope name
         desktop_unit_substring = simple_systemd_escape(
-            sane_split(os.getenv("XDG_CURRENT_DESKTOP", "uwsm"), ":")[0], start=False
+            (os.getenv("XDG_CURRENT_DESKTOP") or "uwsm").partition(":")[0] or "uwsm",
+            start=False,
         )
         cmd_unit_substring = simple_systemd_escape(
             app_name or os.path.basename(cmdline[0]), start=False
@@ -3664,40 +4207,18 @@ def app(
         # if other parts already halfway too long, this means desktop_unit_substring needs some trimming
         if l_all > 127:
             # reduce to 127
-            l_check = l_static
-            fragments = re.split(r"(\\x..)", desktop_unit_substring)
-            desktop_unit_substring = ""
-            for fragment in fragments:
-                if len(fragment) + l_check < 127:
-                    desktop_unit_substring = desktop_unit_substring + fragment
-                    l_check += len(fragment)
-                else:
-                    if fragment.startswith(r"\x"):
-                        break
-                    desktop_unit_substring = (
-                        desktop_unit_substring + fragment[0 : 127 - l_check]
-                    )
-                    break
+            desktop_unit_substring = truncate_escaped(
+                desktop_unit_substring, 127 - l_static
+            )
 
         l_all = l_static + len(desktop_unit_substring) + len(cmd_unit_substring)
 
         # now cut cmd_unit_substring if too long
         if l_all > 255:
             # reduce to 255
-            l_check = l_static + len(desktop_unit_substring)
-            fragments = re.split(r"(\\x..)", cmd_unit_substring)
-            cmd_unit_substring = ""
-            for fragment in fragments:
-                if len(fragment) + l_check < 255:
-                    cmd_unit_substring = cmd_unit_substring + fragment
-                    l_check += len(fragment)
-                else:
-                    if fragment.startswith(r"\x"):
-                        break
-                    cmd_unit_substring = (
-                        cmd_unit_substring + fragment[0 : 255 - l_check]
-                    )
-                    break
+            cmd_unit_substring = truncate_escaped(
+                cmd_unit_substring, 255 - l_static - len(desktop_unit_substring)
+            )
 
         if app_unit_type == "scope":
             unit_name = f"app-{desktop_unit_substring}-{cmd_unit_substring}-{random_hex(8)}.{app_unit_type}"
@@ -3728,7 +4249,7 @@ def app(
                 print_debug("silencing service stdout")
                 final_args.append("--property=StandardOutput=null")
                 # uninherit stderr if inherited
-                bus_session = DbusInteractions("session")
+                bus_session = get_bus("session")
                 sdprops = bus_session.get_systemd_properties(
                     ["DefaultStandardOutput", "DefaultStandardError"]
                 )
@@ -3758,7 +4279,7 @@ def app(
         ]
     )
 
-    print_debug("final_args", *(final_args))
+    print_debug("final_args", final_args)
 
     if return_cmdline:
         return final_args
@@ -3808,14 +4329,20 @@ def app_daemon():
     def send_cmdline(args_in: List, args_out: str):
         "Takes original args_in (list), and final args_out (str), writes to output fifo"
         print_normal(f"received: {shlex.join(args_in)}\nsent: {args_out}")
-        fifo_out_path = create_fifo("uwsm-app-daemon-out")
+        # output fifo is ensured at the start of each cycle
         with open(fifo_out_path, "w", encoding="UTF-8") as fifo_out:
             fifo_out.write(f"{args_out}\n")
 
+    # create both pipes right away
+    fifo_in_path = create_fifo("uwsm-app-daemon-in")
+    fifo_out_path = create_fifo("uwsm-app-daemon-out")
+
     while True:
-        # create both pipes right away and make sure they always exist
-        fifo_in_path = create_fifo("uwsm-app-daemon-in")
-        _ = create_fifo("uwsm-app-daemon-out")
+        # make sure pipes still exist, recreate if removed externally
+        if not os.path.exists(fifo_in_path):
+            create_fifo("uwsm-app-daemon-in")
+        if not os.path.exists(fifo_out_path):
+            create_fifo("uwsm-app-daemon-out")
 
         # argparse exit workaround: read previous wrong args and send error message
         if os.path.isfile(error_flag_path):
@@ -3878,10 +4405,14 @@ def app_daemon():
         print_debug(f"removing {error_flag_path}")
         os.remove(error_flag_path)
 
-        # reset terminal entry
-        Terminal.entry = None
-        Terminal.entry_action_id = ""
-        Terminal.entry_id = ""
+        # reset terminal entry if anything affecting its choice has changed
+        if Terminal.entry is not None and Terminal.stamp != get_terminal_stamp():
+            print_debug("resetting terminal entry")
+            Terminal.entry = None
+            Terminal.entry_action_id = ""
+            Terminal.entry_id = ""
+            Terminal.execarg = None
+            Terminal.stamp = None
 
         # call app with return_cmdline=True
         try:
@@ -3895,16 +4426,18 @@ def app_daemon():
                 unit_description=args.parsed.unit_description,
                 return_cmdline=True,
             )
+            # remember state for newly found terminal entry
+            if Terminal.entry is not None and Terminal.stamp is None:
+                Terminal.stamp = get_terminal_stamp()
             if isinstance(app_args[0], str):
                 print_debug("got single command")
                 args_out = f"exec {shlex.join(app_args)}"
             elif isinstance(app_args[0], (list, tuple)):
                 print_debug("got iterated command")
-                args_out = []
-                for iter_app_args in app_args:
-                    args_out.append(f"{shlex.join(iter_app_args)} &")
-                args_out.append("wait")
-                args_out = " ".join(args_out)
+                args_out = " ".join(
+                    f"{shlex.join(iter_app_args)} &" for iter_app_args in app_args
+                )
+                args_out = f"{args_out} wait"
             send_cmdline(args_in, args_out)
         except Exception as caught_exception:
             send_cmdline(
@@ -3947,7 +4480,7 @@ def fill_comp_globals():
     based on args or desktop entry
     """
 
-    bus_session = DbusInteractions("session")
+    bus_session = get_bus("session")
     print_debug("bus_session initial", bus_session)
 
     # Deal with ID and main argument
@@ -3972,7 +4505,7 @@ def fill_comp_globals():
             main_arg = MainArg(Args.parsed.wm_cmdline[0])
             CompGlobals.cmdline = Args.parsed.wm_cmdline
 
-    if not Val.wm_id.search(CompGlobals.id):
+    if not Val.wm_id.fullmatch(CompGlobals.id):
         raise ValueError(
             f'"{CompGlobals.id}" does not conform to "{Val.wm_id.pattern}" pattern!'
         )
@@ -3987,6 +4520,8 @@ def fill_comp_globals():
 
     # escape CompGlobals.id for systemd
     CompGlobals.id_unit_string = simple_systemd_escape(CompGlobals.id, start=False)
+    CompGlobals.unit_name = f"wayland-wm@{CompGlobals.id_unit_string}.service"
+    CompGlobals.unit_path = DbusInteractions.get_unit_object_path(CompGlobals.unit_name)
 
     if main_arg.path is not None:
         main_arg.check_path()
@@ -4071,7 +4606,7 @@ def fill_comp_globals():
                     raise ValueError(
                         f'Entry "{CompGlobals.id}" uses {BIN_NAME} in "only generate" mode!'
                     )
-                if entry_uwsm_args.parsed.desktop_names and not Val.dn_colon.search(
+                if entry_uwsm_args.parsed.desktop_names and not Val.dn_colon.fullmatch(
                     entry_uwsm_args.parsed.desktop_names
                 ):
                     raise ValueError(
@@ -4151,7 +4686,7 @@ def fill_comp_globals():
             Args.parsed.mode == "aux" and Args.parsed.aux_action == "prepare-env"
         ):
             # check desktop names
-            if Args.parsed.desktop_names and not Val.dn_colon.search(
+            if Args.parsed.desktop_names and not Val.dn_colon.fullmatch(
                 Args.parsed.desktop_names
             ):
                 print_error(
@@ -4194,7 +4729,7 @@ def fill_comp_globals():
             else:
                 CompGlobals.desktop_names = (
                     (
-                        sane_split(os.environ.get("XDG_CURRENT_DESKTOP", ""), ":")
+                        list(get_current_desktops())
                         if not is_active(bus_session=bus_session)
                         else []
                     )
@@ -4215,14 +4750,7 @@ def fill_comp_globals():
             elif entry_uwsm_args is not None and entry_uwsm_args.parsed.wm_name:
                 CompGlobals.name = entry_uwsm_args.parsed.wm_name
             else:
-                CompGlobals.name = " - ".join(
-                    n
-                    for n in (
-                        entry_expand_str(entry.getName()),
-                        entry_expand_str(entry.getGenericName()),
-                    )
-                    if n
-                )
+                CompGlobals.name = entry_display_name(entry)
 
             if Args.parsed.wm_comment:
                 CompGlobals.description = Args.parsed.wm_comment
@@ -4287,7 +4815,7 @@ def fill_comp_globals():
             else:
                 CompGlobals.desktop_names = (
                     (
-                        sane_split(os.environ.get("XDG_CURRENT_DESKTOP", ""), ":")
+                        list(get_current_desktops())
                         if not is_active(bus_session=bus_session)
                         else []
                     )
@@ -4311,9 +4839,9 @@ def fill_comp_globals():
     if Args.parsed.mode == "start" and (
         Args.parsed.hardcode or main_arg.path is not None
     ):
-        canon_arg = os.path.abspath(main_arg.path or which(main_arg.executable))
+        canon_arg = os.path.abspath(main_arg.path or which_cached(main_arg.executable))
         print_debug("normalized", CompGlobals.cmdline[0], canon_arg)
-        CompGlobals.cmdline[0] = os.path.abspath(canon_arg)
+        CompGlobals.cmdline[0] = canon_arg
 
     # fill cli-exclusive compositor arguments for reproduction in unit drop-ins
     CompGlobals.cli_args = Args.parsed.wm_cmdline[1:]
@@ -4328,21 +4856,13 @@ def fill_comp_globals():
         CompGlobals.cli_description = Args.parsed.wm_comment
 
         # deduplicate desktop names, preserving order
-        ddn = []
-        for desktop_name in CompGlobals.cli_desktop_names:
-            if desktop_name not in ddn:
-                ddn.append(desktop_name)
-        CompGlobals.cli_desktop_names = ddn
-        ddn = []
-        for desktop_name in CompGlobals.desktop_names:
-            if desktop_name not in ddn:
-                ddn.append(desktop_name)
-        CompGlobals.desktop_names = ddn
+        CompGlobals.cli_desktop_names = list(
+            dict.fromkeys(CompGlobals.cli_desktop_names)
+        )
+        CompGlobals.desktop_names = list(dict.fromkeys(CompGlobals.desktop_names))
 
     # id for functions and env loading
-    CompGlobals.bin_id = re.sub(
-        "(^[^a-zA-Z]|[^a-zA-Z0-9_])+", "_", CompGlobals.bin_name
-    ).lower()
+    CompGlobals.bin_id = Val.non_id_chars.sub("_", CompGlobals.bin_name).lower()
 
     return
 
@@ -4352,38 +4872,36 @@ def stop_wm():
 
     print_normal("Stopping compositor...")
 
-    bus_session = DbusInteractions("session")
+    bus_session = get_bus("session")
     print_debug("bus_session initial", bus_session)
 
     # query systemd dbus for matching compositor units
     units = bus_session.list_units_by_patterns(
         ["active", "activating"], ["wayland-wm@*.service"]
     )
-    # get only IDs
-    units = [str(unit[0]) for unit in units]
 
     if not units:
         print_ok("Compositor is not running.")
         return False
 
+    unit = str(units[0][0])
+
     # this really shoud not happen
     if len(units) > 1:
-        print_warning(f"Multiple compositor units found: {', '.join(units)}!")
+        print_warning(
+            f"Multiple compositor units found: {', '.join(str(u[0]) for u in units)}!"
+        )
 
     if Args.parsed.dry_run:
-        print_normal(f"Will stop compositor {units[0]}.")
+        print_normal(f"Will stop compositor {unit}.")
         return True
 
-    print_normal(f"Found running compositor {units[0]}.")
+    print_normal(f"Found running compositor {unit}.")
 
-    job = bus_session.stop_unit(units[0], "fail")
+    job = bus_session.stop_unit(unit, "fail")
 
     # wait for job to be done
-    while True:
-        jobs = bus_session.list_systemd_jobs()
-        if job not in [check_job[4] for check_job in jobs]:
-            break
-        time.sleep(0.1)
+    bus_session.wait_systemd_job(job)
     print_ok("Sent stop job.")
 
     return True
@@ -4396,7 +4914,12 @@ def waitpid(pid: int):
     except ProcessLookupError:
         print_normal(f"Process with PID {pid} not found.")
         return
-    select([pid_fd], [], [])
+    try:
+        pid_poll = poll()
+        pid_poll.register(pid_fd, POLLIN)
+        pid_poll.poll()
+    finally:
+        os.close(pid_fd)
     print_normal(f"Process with PID {pid} has ended.")
     return
 
@@ -4411,12 +4934,17 @@ def waitenv(varnames: List[str] = None, timeout=10, step=0.5, end_buffer=3):
     varnames_set = set(varnames)
     varnames_exist_set = set()
 
-    bus_session = DbusInteractions("session")
+    bus_session = get_bus("session")
 
     start_ts = time.monotonic()
+    warn_ts = start_ts + timeout * 0.8
+    deadline = start_ts + timeout
     warned = False
-    for attempt in range(1, int(timeout // step + 1)):
-        aenv_varnames_set = set(bus_session.get_systemd_vars().keys())
+    attempt = 0
+    while True:
+        attempt += 1
+        # only expected names matter, values are not needed
+        aenv_varnames_set = bus_session.get_systemd_varnames(only=varnames_set)
 
         # all is done
         if varnames_set.issubset(aenv_varnames_set):
@@ -4450,7 +4978,7 @@ def waitenv(varnames: List[str] = None, timeout=10, step=0.5, end_buffer=3):
             )
 
         # still not done in 80% of timeout
-        elif (attempt * step) / timeout >= 0.8 and not warned:
+        elif not warned and time.monotonic() >= warn_ts:
             warned = True
             print_warning(
                 "Still waiting for variables in activation environment, nearing timeout:\n"
@@ -4458,9 +4986,10 @@ def waitenv(varnames: List[str] = None, timeout=10, step=0.5, end_buffer=3):
             )
 
         # timeout
-        if time.monotonic() - start_ts > timeout:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
             break
-        time.sleep(step)
+        time.sleep(min(step, remaining))
 
     # let systemd time out units in 10 seconds.
     time.sleep(end_buffer)
@@ -4469,6 +4998,28 @@ def waitenv(varnames: List[str] = None, timeout=10, step=0.5, end_buffer=3):
     )
 
 
+def waitenv_settle(varnames: List[str] = None):
+    """
+    Waits for WAYLAND_DISPLAY, varnames and vars from UWSM_WAIT_VARNAMES,
+    then sleeps for UWSM_WAIT_VARNAMES_SETTLETIME
+    """
+    waitenv(
+        varnames=["WAYLAND_DISPLAY"]
+        + (varnames or [])
+        + os.getenv("UWSM_WAIT_VARNAMES", "").split()
+    )
+    # just to be on the safe side if things are settling down
+    settle_time = os.getenv("UWSM_WAIT_VARNAMES_SETTLETIME", "0.2")
+    try:
+        settle_time = float(settle_time)
+    except ValueError:
+        print_warning(
+            f'"UWSM_WAIT_VARNAMES_SETTLETIME" contains invalid value "{settle_time}", using "0.2"'
+        )
+        settle_time = 0.2
+    time.sleep(settle_time)
+
+
 def main():
     "UWSM main entrypoint"
 
@@ -4485,13 +5036,7 @@ def main():
     #### SELECT
     if Args.parsed.mode == "select":
         try:
-            default_id = get_default_comp_entry()
-            select_wm_id = select_comp_entry(default_id)
-            if select_wm_id:
-                if select_wm_id == default_id:
-                    print_normal(f"Default compositor ID unchanged: {select_wm_id}.")
-                else:
-                    save_default_comp_entry(select_wm_id)
+            if select_and_save_comp_entry():
                 sys.exit(0)
             else:
                 print_warning("No compositor was selected.")
@@ -4509,17 +5054,10 @@ def main():
         # Get ID from whiptail menu
         if Args.parsed.wm_cmdline[0] in ["select", "default"]:
             try:
-                default_id = get_default_comp_entry()
-                select_wm_id = select_comp_entry(
-                    default_id, Args.parsed.wm_cmdline[0] == "default"
+                select_wm_id = select_and_save_comp_entry(
+                    Args.parsed.wm_cmdline[0] == "default"
                 )
                 if select_wm_id:
-                    if select_wm_id == default_id:
-                        print_normal(
-                            f"Default compositor ID unchanged: {select_wm_id}."
-                        )
-                    else:
-                        save_default_comp_entry(select_wm_id)
                     # update Args.parsed.wm_cmdline in place
                     Args.parsed.wm_cmdline = [select_wm_id]
                 else:
@@ -4533,15 +5071,16 @@ def main():
             fill_comp_globals()
 
             print_normal(
-                dedent(
-                    f"""
-                     Selected compositor ID: {CompGlobals.id}
-                               Command Line: {shlex.join(CompGlobals.cmdline)}
-                           Plugin/binary ID: {CompGlobals.bin_id}
-                      Initial Desktop Names: {':'.join(CompGlobals.desktop_names)}
-                                       Name: {CompGlobals.name}
-                                Description: {CompGlobals.description}
-                    """
+                "\n".join(
+                    (
+                        f"Selected compositor ID: {CompGlobals.id}",
+                        f"          Command Line: {shlex.join(CompGlobals.cmdline)}",
+                        f"      Plugin/binary ID: {CompGlobals.bin_id}",
+                        f" Initial Desktop Names: {':'.join(CompGlobals.desktop_names)}",
+                        f"                  Name: {CompGlobals.name}",
+                        f"           Description: {CompGlobals.description}",
+                        "",
+                    )
                 )
             )
 
@@ -4565,7 +5104,7 @@ def main():
                 print_warning("Only unit creation was requested. Will not go further.")
                 sys.exit(0)
 
-            bus_system = DbusInteractions("system")
+            bus_system = get_bus("system")
             print_debug("bus_system initial", bus_system)
 
             # query systemd dbus for active matching units
@@ -4593,17 +5132,13 @@ def main():
                 f"Starting {CompGlobals.id} and waiting while it is running..."
             )
 
-            # start bindpid service on our PID
-            sprc = subprocess.run(
-                [
-                    "systemctl",
-                    "--user",
-                    "start",
-                    f"wayland-session-bindpid@{os.getpid()}.service",
-                ],
-                check=True,
-            )
-            print_debug(sprc)
+            # start bindpid service on our PID and wait for it like systemctl would
+            bindpid_unit = f"wayland-session-bindpid@{os.getpid()}.service"
+            bus_session = get_bus("session")
+            bus_session.wait_systemd_job(bus_session.start_unit(bindpid_unit))
+            bindpid_state = bus_session.get_unit_property(bindpid_unit, "ActiveState")
+            if str(bindpid_state) != "active":
+                raise RuntimeError(f"Failed to start {bindpid_unit}!")
 
             save_env("env_login")
 
@@ -4619,71 +5154,53 @@ def main():
                 # 15 seconds should be more than enough to wait for compositor activation
                 # 10 seconds unit timeout plus 5 on possible overhead
                 # Premature exit is covered explicitly
-                # 0.5s between 30 attempts
-                bus_session = DbusInteractions("session")
+                # do not reuse objects and connections of parent process,
+                # leave inherited connections alone, get_bus() opens own one
+                drop_bus(close=False)
+                bus_session = get_bus("session")
                 print_debug("bus_session holder fork", bus_session)
-                for attempt in range(30, -1, -1):
-                    # if parent process exits at this stage, silently exit
-                    try:
-                        os.kill(mainpid, 0)
-                    except ProcessLookupError:
-                        print_debug(
-                            "holder exiting due to premature parent process end"
-                        )
-                        sys.exit(0)
-
-                    # timed out
-                    if attempt == 0:
-                        print_warning(
-                            f"Timed out waiting for activation of wayland-wm@{CompGlobals.id_unit_string}.service"
-                        )
-                        try:
-                            print_debug("killing main process from holder")
-                            os.kill(mainpid, signal.SIGTERM)
-                        except ProcessLookupError:
-                            print_debug("main process already absent")
-                            pass
-                        sys.exit(1)
-
-                    time.sleep(0.5)
-                    print_debug(f"holder attempt {attempt}")
+                # if parent process exits at this stage, silently exit
+                try:
+                    mainpid_fd = os.pidfd_open(mainpid)
+                except ProcessLookupError:
+                    print_debug("holder exiting due to premature parent process end")
+                    sys.exit(0)
+                activated = bus_session.wait_unit_active(
+                    CompGlobals.unit_name,
+                    timeout=15,
+                    path=CompGlobals.unit_path,
+                    watch_fds=(mainpid_fd,),
+                )
+                if activated is None:
+                    print_debug("holder exiting due to premature parent process end")
+                    sys.exit(0)
+                os.close(mainpid_fd)
 
-                    # query systemd dbus for active matching units
-                    units = bus_session.list_units_by_patterns(
-                        ["active", "activating"],
-                        [f"wayland-wm@{CompGlobals.id_unit_string}.service"],
+                # timed out
+                if not activated:
+                    print_warning(
+                        f"Timed out waiting for activation of {CompGlobals.unit_name}"
                     )
-                    print_debug("holder units", units)
-                    if len(units) > 0:
-                        break
+                    try:
+                        print_debug("killing main process from holder")
+                        os.kill(mainpid, signal.SIGTERM)
+                    except ProcessLookupError:
+                        print_debug("main process already absent")
+                    sys.exit(1)
 
-                # Strangely, MainPID unit property is not accessible via DBus.
-                # systemctl to the rescue!
-                sprc = subprocess.run(
-                    [
-                        "systemctl",
-                        "--user",
-                        "show",
-                        "--property",
-                        "MainPID",
-                        "--value",
-                        f"wayland-wm@{CompGlobals.id_unit_string}.service",
-                    ],
-                    check=True,
-                    text=True,
-                    capture_output=True,
+                # MainPID is a property of Service interface, not Unit
+                cpid = str(
+                    bus_session.get_service_property(CompGlobals.unit_name, "MainPID")
                 )
-                cpid = sprc.stdout.strip()
-                if not cpid or not cpid.isnumeric():
-                    print_warning(
-                        f"Could not get MainPID of wayland-wm@{CompGlobals.id_unit_string}.service"
-                    )
+                if not cpid.isnumeric() or cpid == "0":
+                    print_warning(f"Could not get MainPID of {CompGlobals.unit_name}")
                     sys.exit(1)
 
                 print_normal(f"Holding until PID {cpid} exits")
                 # use lightweight waitpid if available
-                if which("waitpid"):
-                    os.execlp("waitpid", "waitpid", "-e", cpid)
+                waitpid_path = which_cached("waitpid")
+                if waitpid_path:
+                    os.execv(waitpid_path, ["waitpid", "-e", cpid])
                 else:
                     waitpid(int(cpid))
                     sys.exit(0)
@@ -4698,7 +5215,7 @@ def main():
                 "--user",
                 "start",
                 "--wait",
-                f"wayland-wm@{CompGlobals.id_unit_string}.service",
+                CompGlobals.unit_name,
             )
 
         except Exception as caught_exception:
@@ -4793,18 +5310,18 @@ def main():
         # check if parent process is a login shell
         if not Args.parsed.nologin:
             try:
-                with open(
-                    f"/proc/{os.getppid()}/cmdline", "r", encoding="UTF-8"
-                ) as ppcmdline:
-                    parent_cmdline = ppcmdline.read()
-                    parent_cmdline = parent_cmdline.strip()
-                print_debug(f"parent_pid: {os.getppid()}")
-                print_debug(f"parent_cmdline: {parent_cmdline}")
+                # login shell is marked by "-" as the first byte of argv[0]
+                with open(f"/proc/{os.getppid()}/cmdline", "rb") as ppcmdline:
+                    parent_cmdline = ppcmdline.read(1)
+                    if DebugFlag.debug:
+                        parent_cmdline += ppcmdline.read()
+                print_debug("parent_pid", os.getppid())
+                print_debug("parent_cmdline", parent_cmdline)
             except Exception as caught_exception:
                 print_error("Could not determine parent process command!")
                 print_error(caught_exception)
                 sys.exit(1)
-            if not parent_cmdline.startswith("-"):
+            if not parent_cmdline.startswith(b"-"):
                 dealbreakers.append("Not in login shell")
 
         # check foreground VT
@@ -4823,7 +5340,7 @@ def main():
         # check for graphical target
         if Args.parsed.gst_seconds > 0:
             try:
-                bus_system = DbusInteractions("system")
+                bus_system = get_bus("system")
                 print_debug("bus_system initial", bus_system)
 
                 # initial check
@@ -4835,32 +5352,34 @@ def main():
                 if len(units) < 1:
                     # check if graphical.target is queued for startup,
                     # wait if it is, recheck when it leaves queue.
-                    gst_seen_in_queue = False
-                    spacer = ""
-                    for attempt in range(Args.parsed.gst_seconds, -1, -1):
-                        jobs = (
-                            (str(unit), str(state))
-                            for _, unit, state, _, _, _ in bus_system.list_systemd_jobs()
-                        )
-                        print_debug("system jobs", jobs)
-                        if ("graphical.target", "start") in jobs:
-                            gst_seen_in_queue = True
-                            if (
-                                not Args.parsed.quiet
-                                and attempt == Args.parsed.gst_seconds
-                            ):
-                                print_normal(
-                                    f"graphical.target is queued for start, waiting for {Args.parsed.gst_seconds}s...",
-                                )
-                            elif not Args.parsed.quiet and (
+                    gst_seen_in_queue = ("graphical.target", "start") in (
+                        (str(unit), str(state))
+                        for _, unit, state, _, _, _ in bus_system.list_systemd_jobs()
+                    )
+                    if gst_seen_in_queue:
+                        if not Args.parsed.quiet:
+                            print_normal(
+                                f"graphical.target is queued for start, waiting for {Args.parsed.gst_seconds}s...",
+                            )
+                        countdown = {"attempt": Args.parsed.gst_seconds, "spacer": ""}
+
+                        def gst_tick():
+                            "Prints countdown"
+                            countdown["attempt"] -= 1
+                            attempt = countdown["attempt"]
+                            if not Args.parsed.quiet and (
                                 attempt % 10 == 0 or attempt == 15 or attempt < 10
                             ):
-                                print_normal(f"{spacer}{attempt}", end="")
-                                spacer = " "
-                            if attempt != 0:
-                                time.sleep(1)
-                        else:
-                            break
+                                print_normal(f"{countdown['spacer']}{attempt}", end="")
+                                countdown["spacer"] = " "
+
+                        # wakes up as soon as start job leaves the queue
+                        bus_system.wait_systemd_job_done(
+                            "graphical.target",
+                            "start",
+                            timeout=Args.parsed.gst_seconds,
+                            tick=gst_tick,
+                        )
 
                     if not Args.parsed.quiet and gst_seen_in_queue:
                         print_normal("")
@@ -4936,7 +5455,7 @@ def main():
                 print_normal(f"Starting: {shlex.join(CompGlobals.cmdline)}...")
 
                 # get current systemd environment
-                bus_session = DbusInteractions("session")
+                bus_session = get_bus("session")
                 env_pre = filter_varnames(bus_session.get_systemd_vars())
 
                 # fork out a process that will watch for expected variables
@@ -4951,24 +5470,18 @@ def main():
                     if os.fork() != 0:
                         sys.exit(0)
                     try:
-                        waitenv(
-                            varnames=["WAYLAND_DISPLAY"]
-                            + os.getenv("UWSM_WAIT_VARNAMES", "").split()
-                        )
-                        # just to be on the safe side if things are settling down
-                        settle_time = os.getenv("UWSM_WAIT_VARNAMES_SETTLETIME", "0.2")
-                        try:
-                            settle_time = float(settle_time)
-                        except Exception:
-                            print_warning(
-                                f'"UWSM_WAIT_VARNAMES_SETTLETIME" contains invalid value "{settle_time}", using "0.2"'
-                            )
-                            settle_time = 0.2
-                        time.sleep(settle_time)
+                        waitenv_settle()
 
                         # calculate environment delta and update cleanup list
-                        env_post = filter_varnames(bus_session.get_systemd_vars())
-                        env_delta = dict(set(env_post.items()) - set(env_pre.items()))
+                        # (only the delta needs filtering, env_pre is already clean)
+                        env_post = bus_session.get_systemd_vars()
+                        env_delta = filter_varnames(
+                            {
+                                var: value
+                                for var, value in env_post.items()
+                                if env_pre.get(var) != value
+                            }
+                        )
 
                         if env_delta:
                             # sync delta to dbus
@@ -4992,7 +5505,8 @@ def main():
                             active=False, activating=True, bus_session=bus_session
                         ):
                             print_normal(f"Declaring unit for {CompGlobals.id} ready.")
-                            os.execlp("systemd-notify", "systemd-notify", "--ready")
+                            notify_ready()
+                            sys.exit(0)
                         else:
                             print_normal(
                                 f"Unit for {CompGlobals.id} is already active."
@@ -5028,21 +5542,7 @@ def main():
 
         elif Args.parsed.aux_action == "waitenv":
             try:
-                waitenv(
-                    varnames=["WAYLAND_DISPLAY"]
-                    + Args.parsed.env_names
-                    + os.getenv("UWSM_WAIT_VARNAMES", "").split()
-                )
-                # just to be on the safe side if things are settling down
-                settle_time = os.getenv("UWSM_WAIT_VARNAMES_SETTLETIME", "0.2")
-                try:
-                    settle_time = float(settle_time)
-                except Exception:
-                    print_warning(
-                        f'"UWSM_WAIT_VARNAMES_SETTLETIME" contains invalid value "{settle_time}", using "0.2"'
-                    )
-                    settle_time = 0.2
-                time.sleep(settle_time)
+                waitenv_settle(Args.parsed.env_names)
                 sys.exit(0)
             except Exception as caught_exception:
                 print_error(caught_exception)
@@ -2,10 +2,7 @@ import os
 import sys
 import re
 import textwrap
-import random
 import syslog
-import traceback
-from io import StringIO
 from typing import List
 
 
@@ -15,11 +12,9 @@ class DebugFlag:
     warning = None
     if debug.isnumeric():
         debug = int(debug) > 0
-    elif not debug:
-        debug = False
-    elif debug.lower().capitalize() in ("Yes", "True", "Y"):
+    elif debug.lower() in ("yes", "true", "y"):
         debug = True
-    elif not debug or debug.lower().capitalize() in ("No", "False", "N"):
+    elif debug.lower() in ("", "no", "false", "n"):
         debug = False
     else:
         warning = f'Expected boolean or numeric or empty value for DEBUG, got "{debug}", assuming False'
@@ -53,18 +48,25 @@ class Styles:
 
 class Val:
     "Compiled re patterns for validation"
-    wm_id = re.compile(r"\A[a-zA-Z0-9_:.-]+\Z", re.MULTILINE)
-    dn_colon = re.compile(r"\A[a-zA-Z0-9_.-]+(:[a-zA-Z0-9_.-]+)*\Z", re.MULTILINE)
-    entry_id = re.compile(r"\A[a-zA-Z0-9_][a-zA-Z0-9_.-]*.desktop\Z", re.MULTILINE)
-    action_id = re.compile(r"\A[a-zA-Z0-9-]+\Z", re.MULTILINE)
+    # for use with fullmatch
+    wm_id = re.compile(r"[a-zA-Z0-9_:.-]+", re.ASCII)
+    dn_colon = re.compile(r"[a-zA-Z0-9_.-]+(:[a-zA-Z0-9_.-]+)*", re.ASCII)
+    entry_id = re.compile(r"[a-zA-Z0-9_][a-zA-Z0-9_.-]*.desktop", re.ASCII)
+    action_id = re.compile(r"[a-zA-Z0-9-]+", re.ASCII)
     unit_ext = re.compile(
-        r"[a-zA-Z0-9_:.\\-]+@?\.(service|slice|scope|target|socket|d/[a-zA-Z0-9_:.\\-]+.conf)\Z",
-        re.MULTILINE,
-    )
-    sh_varname = re.compile(
-        r"\A([a-zA-Z_][a-zA-Z0-9_]+|[a-zA-Z][a-zA-Z0-9_]*)\Z", re.MULTILINE
+        r"[a-zA-Z0-9_:.\\-]+@?\.(?:service|slice|scope|target|socket|d/[a-zA-Z0-9_:.\\-]+\.conf)\Z",
+        re.ASCII,
     )
-    invalid_locale_key_error = re.compile(r"^Invalid key: \w+\[.+\]$")
+    # shell identifier except lone "_", branches differ by the first char
+    sh_varname = re.compile(r"[a-zA-Z][a-zA-Z0-9_]*|_[a-zA-Z0-9_]+", re.ASCII)
+    # runs of chars to replace with "_" to make an id from executable name
+    non_id_chars = re.compile(r"(^[^a-zA-Z]|[^a-zA-Z0-9_])+", re.ASCII)
+    # % field codes in Exec= arguments
+    entry_field = re.compile(r"(?!^|[^%])%[a-zA-Z]", re.ASCII)
+    entry_field_deprecated = re.compile(r"%[DdNnvm]", re.ASCII)
+    invalid_locale_key_error = re.compile(r"^Invalid key: \w+\[.+\]$", re.ASCII)
+    # raw content of /sys/class/tty/tty0/active
+    active_tty = re.compile(rb"\s*tty([0-9]+)\s*\Z")
 
 
 def dedent(data: str) -> str:
@@ -75,20 +77,38 @@ def dedent(data: str) -> str:
 
 def random_hex(length: int = 16) -> str:
     "Returns random hex string of length"
-    return "".join([random.choice(list("0123456789abcdef")) for _ in range(length)])
+    return os.urandom((length + 1) // 2).hex()[:length]
 
 
 def sane_split(string: str, delimiter: str) -> List[str]:
     "Splits string by delimiter, but returns empty list on empty string"
-    if not isinstance(string, str):
-        raise TypeError(f'"string" should be a string, got: {type(string)}')
-    if not isinstance(delimiter, str):
-        raise TypeError(f'"delimiter" should be a string, got: {type(delimiter)}')
-    if not delimiter:
-        raise ValueError('"delimiter" should not be empty')
+    # argument sanity checks, skipped under python -O
+    if __debug__:
+        if not isinstance(string, str):
+            raise TypeError(f'"string" should be a string, got: {type(string)}')
+        if not isinstance(delimiter, str):
+            raise TypeError(f'"delimiter" should be a string, got: {type(delimiter)}')
+        if not delimiter:
+            raise ValueError('"delimiter" should not be empty')
     return string.split(delimiter) if string else []
 
 
+# syslog priorities for loglevels 0-7 (EMERG-DEBUG) with USER facility
+SYSLOG_PRIORITIES = tuple(
+    level | syslog.LOG_USER
+    for level in (
+        syslog.LOG_EMERG,
+        syslog.LOG_ALERT,
+        syslog.LOG_CRIT,
+        syslog.LOG_ERR,
+        syslog.LOG_WARNING,
+        syslog.LOG_NOTICE,
+        syslog.LOG_INFO,
+        syslog.LOG_DEBUG,
+    )
+)
+
+
 # all print_* functions force flush for synchronized output
 def print_normal(*what, **how):
     """
@@ -100,7 +120,10 @@ def print_normal(*what, **how):
     print(*what, **how, flush=True)
 
     if log:
-        syslog.syslog(syslog.LOG_INFO | syslog.LOG_USER, str(*what))
+        sep = how.get("sep")
+        syslog.syslog(
+            SYSLOG_PRIORITIES[6], (" " if sep is None else sep).join(map(str, what))
+        )
 
 
 def print_fancy(*what, **how):
@@ -113,51 +136,50 @@ def print_fancy(*what, **how):
     'loglevel': 0-7 (EMERG-DEBUG), default 5 (NOTICE)
     'logprefix': False (prefix lines with 'loglevel' for journal)
     """
-    file = how.pop("file", sys.stdout)
-    color = how.pop("color", Styles.green)
-    notify = how.pop("notify", 0)
-    notify_urgency = how.pop("notify_urgency", 0)
-    log = how.pop("log", LogFlag.log)
-    loglevel = how.pop("loglevel", 5)
-    logprefix = how.pop("logprefix", LogFlag.prefix)
-
-    # print colored text for interactive output
-    if file.isatty():
-        print(color, end="", file=file, flush=True)
-        print(*what, **how, file=file, flush=True)
-        print(Styles.reset, end="", file=file, flush=True)
-    # print lines prefixed with loglevel for journal
-    elif logprefix:
-        # print to fake file, add line prefixes, print for real
-        print_string = StringIO()
-        print(*what, **how, file=print_string, flush=True)
-        prefixed_lines = []
-        for line in print_string.getvalue().splitlines():
-            prefixed_lines.append(f"<{loglevel}>{line}")
-        print("\n".join(prefixed_lines), **how, file=file, flush=True)
-    # simple print
+    # options are only looked up where they matter
+    file = how.get("file", sys.stdout)
+
+    # assemble output the way print() would, to write it at once
+    sep = how.get("sep")
+    end = how.get("end")
+    text = (" " if sep is None else sep).join(map(str, what))
+    end = "\n" if end is None else end
+    is_tty = file.isatty()
+
+    # colored text for interactive output
+    if is_tty:
+        file.write(f"{how.get('color', Styles.green)}{text}{end}{Styles.reset}")
+    # lines prefixed with loglevel for journal
+    elif how.get("logprefix", LogFlag.prefix):
+        loglevel = how.get("loglevel", 5)
+        prefixed_lines = (f"<{loglevel}>{line}" for line in text.split("\n"))
+        file.write("\n".join(prefixed_lines) + end)
+    # simple text
     else:
-        print(*what, **how, file=file, flush=True)
+        file.write(text + end)
+    file.flush()
+
+    if how.get("log", LogFlag.log):
+        syslog.syslog(SYSLOG_PRIORITIES[how.get("loglevel", 5)], text)
+
+    notify = how.get("notify", 0)
+    if notify and (not is_tty or notify == 2):
+        # late import, uwsm.dbus depends on this module
+        from uwsm.dbus import get_bus, drop_bus
 
-    if log:
-        sl_level = [
-            syslog.LOG_EMERG,
-            syslog.LOG_ALERT,
-            syslog.LOG_CRIT,
-            syslog.LOG_ERR,
-            syslog.LOG_WARNING,
-            syslog.LOG_NOTICE,
-            syslog.LOG_INFO,
-            syslog.LOG_DEBUG,
-        ][loglevel]
-        syslog.syslog(sl_level | syslog.LOG_USER, str(*what))
-
-    if notify and (not file.isatty() or notify == 2):
         try:
-            bus_session = DbusInteractions("session")
-            msg = str(*what)
-            bus_session.notify(summary="Message", body=msg, urgency=notify_urgency)
+            bus_session = get_bus("session")
+            bus_session.notify(
+                summary="Message", body=text, urgency=how.get("notify_urgency", 0)
+            )
         except Exception as caught_exception:
+            # let the next notification reconnect if the bus went away
+            if (
+                hasattr(caught_exception, "get_dbus_name")
+                and caught_exception.get_dbus_name()
+                == "org.freedesktop.DBus.Error.Disconnected"
+            ):
+                drop_bus("session")
             print_warning(caught_exception, notify=0)
 
 
@@ -171,25 +193,11 @@ def print_ok(*what, **how):
     'loglevel': 0-7 (EMERG-DEBUG), default 5 (NOTICE)
     'logprefix': False (prefix lines with 'loglevel' for journal)
     """
-    file = how.pop("file", sys.stdout)
-    color = how.pop("color", Styles.green)
-    notify = how.pop("notify", 0)
-    notify_urgency = how.pop("notify_urgency", 0)
-    log = how.pop("log", LogFlag.log)
-    loglevel = how.pop("loglevel", 5)
-    logprefix = how.pop("logprefix", LogFlag.prefix)
-
-    print_fancy(
-        *what,
-        **how,
-        file=file,
-        color=color,
-        notify=notify,
-        notify_urgency=notify_urgency,
-        log=log,
-        loglevel=loglevel,
-        logprefix=logprefix,
-    )
+    how.setdefault("color", Styles.green)
+    how.setdefault("notify_urgency", 0)
+    how.setdefault("loglevel", 5)
+
+    print_fancy(*what, **how)
 
 
 def print_warning(*what, **how):
@@ -202,25 +210,11 @@ def print_warning(*what, **how):
     'loglevel': 0-7 (EMERG-DEBUG), default 4 (WARNING)
     'logprefix': False (prefix lines with 'loglevel' for journal)
     """
-    file = how.pop("file", sys.stdout)
-    color = how.pop("color", Styles.yellow)
-    notify = how.pop("notify", 0)
-    notify_urgency = how.pop("notify_urgency", 1)
-    log = how.pop("log", LogFlag.log)
-    loglevel = how.pop("loglevel", 4)
-    logprefix = how.pop("logprefix", LogFlag.prefix)
-
-    print_fancy(
-        *what,
-        **how,
-        file=file,
-        color=color,
-        notify=notify,
-        notify_urgency=notify_urgency,
-        log=log,
-        loglevel=loglevel,
-        logprefix=logprefix,
-    )
+    how.setdefault("color", Styles.yellow)
+    how.setdefault("notify_urgency", 1)
+    how.setdefault("loglevel", 4)
+
+    print_fancy(*what, **how)
 
 
 def print_error(*what, **how):
@@ -233,54 +227,31 @@ def print_error(*what, **how):
     'loglevel': 0-7 (EMERG-DEBUG), default 3 (ERR)
     'logprefix': False (prefix lines with 'loglevel' for journal)
     """
-    file = how.pop("file", sys.stderr)
-    color = how.pop("color", Styles.red)
-    notify = how.pop("notify", 0)
-    notify_urgency = how.pop("notify_urgency", 2)
-    log = how.pop("log", LogFlag.log)
-    loglevel = how.pop("loglevel", 3)
-    logprefix = how.pop("logprefix", LogFlag.prefix)
-
-    print_fancy(
-        *what,
-        **how,
-        file=file,
-        color=color,
-        notify=notify,
-        notify_urgency=notify_urgency,
-        log=log,
-        loglevel=loglevel,
-        logprefix=logprefix,
-    )
+    how.setdefault("file", sys.stderr)
+    how.setdefault("color", Styles.red)
+    how.setdefault("notify_urgency", 2)
+    how.setdefault("loglevel", 3)
+
+    print_fancy(*what, **how)
 
 
 if DebugFlag.debug:
-    from inspect import stack
 
     def print_debug(*what, **how):
         "Prints to stderr with DEBUG and END_DEBUG marks"
         dsep = "\n" if "sep" not in how or "\n" not in how["sep"] else ""
-        file = how.pop("file", sys.stderr)
-        color = how.pop("color", Styles.grey)
-        notify = 0
-        notify_urgency = 0
-        log = how.pop("log", LogFlag.log)
-        loglevel = 7
-        logprefix = how.pop("logprefix", LogFlag.prefix)
-
-        my_stack = stack()
+        how.setdefault("file", sys.stderr)
+        how.setdefault("color", Styles.grey)
+        how["notify"] = 0
+        how["loglevel"] = 7
+
+        # caller frame
+        frame = sys._getframe(1)
         print_fancy(
-            f"DEBUG {my_stack[1].filename}:{my_stack[1].lineno} {my_stack[1].function}{dsep}",
+            f"DEBUG {frame.f_code.co_filename}:{frame.f_lineno} {frame.f_code.co_name}{dsep}",
             *what,
             f"{dsep}END_DEBUG",
             **how,
-            file=file,
-            color=color,
-            notify=notify,
-            notify_urgency=notify_urgency,
-            log=log,
-            loglevel=loglevel,
-            logprefix=logprefix,
         )
 
 else:
@@ -292,9 +263,12 @@ else:
 
 def print_style(stls, *what, **how):
     "Prints selected style(s), then args, then resets"
-    if isinstance(stls, str):
-        stls = [stls]
-    for style in stls:
-        print(style, end="", flush=True)
-    print(*what, **how, flush=True)
-    print(Styles.reset, end="", file=sys.stderr, flush=True)
+    styles = stls if isinstance(stls, str) else "".join(stls)
+    file = how.get("file", sys.stdout)
+    sep = how.get("sep")
+    end = how.get("end")
+    text = (" " if sep is None else sep).join(map(str, what))
+    end = "\n" if end is None else end
+    # reset goes to the same file as styled text, in one write
+    file.write(f"{styles}{text}{end}{Styles.reset}")
+    file.flush()